@@ -9,7 +9,7 @@ from preprocessing.features.temporal import extract_temporal_features
 from preprocessing.features.frequency import extract_frequency_features
 from preprocessing.features.residual import extract_residual_features
 from preprocessing.features.shape import extract_shape_features
-from preprocessing.features.transit import extract_transit_features
+from preprocessing.features.transit import extract_transit_features, extract_transit_features_batch
 from preprocessing.features.centroid import extract_centroid_features
 
 __all__ = [
@@ -19,5 +19,6 @@ __all__ = [
     'extract_residual_features',
     'extract_shape_features',
     'extract_transit_features',
+    'extract_transit_features_batch',
     'extract_centroid_features',
 ]
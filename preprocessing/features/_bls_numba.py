@@ -0,0 +1,397 @@
+"""
+Numba-compiled BLS periodogram core.
+
+astropy's ``BoxLeastSquares.autopower`` dispatches a Python-level loop over
+trial periods into generic binning code, and that call dominates per-star
+wall time in `extract_transit_features`. This module reimplements the
+search as a single compiled kernel in the style of Kovacs et al. (2002):
+phase-fold into a small number of bins (the working set stays in L2),
+then slide a contiguous-bin box window per trial duration and keep the
+best Signal Residue per trial period.
+
+The power statistic is the weighted Signal Residue squared,
+``(s/n)^2 / (r*(1-r)) / (sum(x^2)/n)`` with ``x`` the mean-subtracted
+flux and ``s`` the in-window sum of ``x``. The ANOVA inequality bounds
+it to [0, 1] (the in-window variance explained cannot exceed the total),
+so it is commensurate with the existing BLS_SIGNIFICANCE_THRESHOLD
+scale; the unweighted form ``s^2 / (r*(1-r)) / sum(x^2)`` is n times
+larger and sits near 1 even for pure noise.
+
+numba is an optional acceleration: when it is not importable the caller
+(`preprocessing.features.transit`) falls back to astropy's
+BoxLeastSquares, so this module must always import cleanly.
+"""
+
+import threading
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator so the module imports without numba."""
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+    prange = range
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def bls_power(time, flux, periods, durations, n_bins=256):
+    """
+    Compute the best box fit for every trial period.
+
+    Args:
+        time: Time array, epoch-subtracted (days, starts near 0)
+        flux: Normalized flux array (same length as time)
+        periods: Trial periods (days), ascending
+        durations: Trial transit durations (days)
+        n_bins: Number of phase bins for the folded accumulators
+
+    Returns:
+        Tuple of per-period arrays (power, t0, duration, depth).
+        Depth is positive for a dip; t0 is the mid-transit time in the
+        same (epoch-subtracted) frame as `time`.
+    """
+    n = time.shape[0]
+    n_periods = periods.shape[0]
+    n_durations = durations.shape[0]
+
+    best_power = np.zeros(n_periods)
+    best_t0 = np.zeros(n_periods)
+    best_duration = np.zeros(n_periods)
+    best_depth = np.zeros(n_periods)
+
+    # Global flux moments (shared by every trial period)
+    flux_sum = 0.0
+    for i in range(n):
+        flux_sum += flux[i]
+    flux_mean = flux_sum / n
+
+    sum_x2 = 0.0
+    for i in range(n):
+        dx = flux[i] - flux_mean
+        sum_x2 += dx * dx
+
+    if sum_x2 <= 0.0:
+        return best_power, best_t0, best_duration, best_depth
+
+    for ip in prange(n_periods):
+        p = periods[ip]
+        inv_p = 1.0 / p
+
+        # Phase-fold into n_bins accumulators of (sum deviation, count).
+        # Explicit scalar loops: Numba compiles these tighter than
+        # numpy-style fancy indexing.
+        bin_sum = np.zeros(n_bins)
+        bin_cnt = np.zeros(n_bins, dtype=np.int64)
+        for i in range(n):
+            ph = time[i] * inv_p
+            ph = ph - int(ph)  # fractional phase in [0, 1)
+            b = int(ph * n_bins)
+            if b >= n_bins:
+                b = n_bins - 1
+            bin_sum[b] += flux[i] - flux_mean
+            bin_cnt[b] += 1
+
+        p_best = 0.0
+        t0_best = 0.0
+        dur_best = 0.0
+        depth_best = 0.0
+
+        for idur in range(n_durations):
+            w = int(durations[idur] * inv_p * n_bins + 0.5)
+            if w < 1:
+                w = 1
+            if w >= n_bins:
+                continue
+
+            # Initial window [0, w), then slide circularly so transits
+            # that wrap around phase 0 are still found
+            s = 0.0
+            cnt = 0
+            for b in range(w):
+                s += bin_sum[b]
+                cnt += bin_cnt[b]
+
+            for start in range(n_bins):
+                if 0 < cnt < n and s < 0.0:  # require a dip, not a brightening
+                    r = cnt / n
+                    # Weighted SR^2 — the extra n in the denominator keeps
+                    # the statistic in [0, 1]; without it pure noise
+                    # already scores ~1 per trial
+                    sr = (s * s) / (n * r * (1.0 - r)) / sum_x2
+                    if sr > p_best:
+                        p_best = sr
+                        t0_best = (start + 0.5 * w) / n_bins * p
+                        if t0_best >= p:
+                            t0_best -= p
+                        dur_best = w / n_bins * p
+                        # depth = out-of-transit mean minus in-transit mean
+                        depth_best = (-s / (n - cnt)) - (s / cnt)
+
+                # Slide: drop `start`, add the bin entering on the right
+                s -= bin_sum[start]
+                cnt -= bin_cnt[start]
+                nxt = start + w
+                if nxt >= n_bins:
+                    nxt -= n_bins
+                s += bin_sum[nxt]
+                cnt += bin_cnt[nxt]
+
+        best_power[ip] = p_best
+        best_t0[ip] = t0_best
+        best_duration[ip] = dur_best
+        best_depth[ip] = depth_best
+
+    return best_power, best_t0, best_duration, best_depth
+
+
+# Pre-bound BLS entry points keyed by (cadence, baseline) class. Kepler
+# delivers only two cadence types (29.4-min long cadence and 58.85-s
+# short cadence), so a handful of keys covers an entire catalog run.
+_SPECIALIZED_BLS = {}
+_SPECIALIZED_BLS_MAX = 8
+# Callers arrive from thread pools (segment BLS, batch extraction);
+# the evict-then-insert sequence below must not interleave
+_SPECIALIZED_BLS_LOCK = threading.Lock()
+
+
+def get_specialized_bls(cadence_minutes, baseline_days, periods, durations, n_bins=256):
+    """
+    Return a BLS entry point specialized for one (cadence, baseline) class.
+
+    The trial grids depend only on cadence and baseline, so the returned
+    callable pre-binds them: the hot path takes just (time, flux), with
+    no per-call grid plumbing or validation. Full runtime codegen —
+    baking the grids in as compile-time constants — would trigger a
+    fresh JIT compile per class; pre-binding gets the same per-call
+    saving while sharing one kernel binary. Specializations are cached
+    by quantized (cadence, baseline) key.
+    """
+    # The duration grid is baked into the bound callable, so it belongs
+    # in the key: same-cadence targets with different stellar radii get
+    # different grids and must not share a specialization
+    key = (
+        round(cadence_minutes, 1),
+        round(baseline_days, 0),
+        round(float(durations[0]), 6),
+        round(float(durations[-1]), 6),
+        len(durations),
+    )
+    with _SPECIALIZED_BLS_LOCK:
+        fn = _SPECIALIZED_BLS.get(key)
+        if fn is None:
+            bound_periods = np.ascontiguousarray(periods)
+            bound_durations = np.ascontiguousarray(durations)
+
+            def fn(time, flux):
+                return run_bls(time, flux, bound_periods, bound_durations, n_bins)
+
+            if len(_SPECIALIZED_BLS) >= _SPECIALIZED_BLS_MAX:
+                _SPECIALIZED_BLS.pop(next(iter(_SPECIALIZED_BLS)))
+            _SPECIALIZED_BLS[key] = fn
+    return fn
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def bls_batch(flat_time, flat_flux, offsets, periods, durations, n_bins,
+              out_power, out_period, out_t0, out_duration, out_depth):
+    """
+    Run the BLS search for a batch of stars in one compiled dispatch.
+
+    Light curves are packed jagged-array style: star ``s`` occupies
+    ``flat_time[offsets[s]:offsets[s+1]]``. The outer star loop is a
+    prange, so the batch spreads across cores with a single JIT dispatch
+    instead of one Python->Numba round trip per star. All stars share
+    the same trial grid (valid when they share cadence and baseline,
+    the common case for same-quarter Kepler batches).
+
+    Results are written into the preallocated out_* arrays by star index.
+    """
+    n_stars = offsets.shape[0] - 1
+    for s in prange(n_stars):
+        t = flat_time[offsets[s]:offsets[s + 1]]
+        f = flat_flux[offsets[s]:offsets[s + 1]]
+        power, t0, dur, depth = bls_power(t, f, periods, durations, n_bins)
+
+        best = 0
+        for ip in range(1, periods.shape[0]):
+            if power[ip] > power[best]:
+                best = ip
+
+        out_power[s] = power[best]
+        out_period[s] = periods[best]
+        out_t0[s] = t0[best]
+        out_duration[s] = dur[best]
+        out_depth[s] = depth[best]
+
+
+def run_bls_batch(times, fluxes, periods, durations, n_bins=256):
+    """
+    Batched counterpart of run_bls for stars sharing one trial grid.
+
+    Packs the input light curves into flat arrays with an offsets index,
+    dispatches bls_batch once, and returns per-star best-fit arrays
+    (power, period, t0, duration, depth).
+    """
+    n_stars = len(times)
+    offsets = np.zeros(n_stars + 1, dtype=np.int64)
+    for s, t in enumerate(times):
+        offsets[s + 1] = offsets[s] + len(t)
+
+    flat_time = np.concatenate(times)
+    flat_flux = np.concatenate(fluxes)
+
+    out_power = np.zeros(n_stars)
+    out_period = np.zeros(n_stars)
+    out_t0 = np.zeros(n_stars)
+    out_duration = np.zeros(n_stars)
+    out_depth = np.zeros(n_stars)
+
+    bls_batch(
+        flat_time, flat_flux, offsets,
+        np.ascontiguousarray(periods),
+        np.ascontiguousarray(durations),
+        n_bins,
+        out_power, out_period, out_t0, out_duration, out_depth,
+    )
+    return out_power, out_period, out_t0, out_duration, out_depth
+
+
+@njit(fastmath=True, cache=True)
+def fold_and_reduce(time, flux, t0, period, duty):
+    """
+    Fused phase-fold + in-transit reductions in one pass.
+
+    Streams time/flux exactly once: for each point the phase is folded,
+    tested against the transit window, and Welford-style running moments
+    are updated for the in-transit flux and phase residual (in days).
+    Also counts ingress events (separate in-transit runs in time order).
+    Replaces four numpy passes (phase, mask, gather, mean/std) plus two
+    temporary arrays per light curve.
+
+    Args:
+        time: Time array (days)
+        flux: Normalized flux array
+        t0: Mid-transit epoch (same frame as time)
+        period: Transit period (days)
+        duty: Transit duration as a fraction of the period
+
+    Returns:
+        Tuple of (n_in_transit, n_transit_events, depth_mean, depth_std,
+        phase_residual_std_days).
+    """
+    n = time.shape[0]
+    inv_p = 1.0 / period
+
+    n_in = 0
+    n_events = 0
+    prev_in = False
+    mean_f = 0.0
+    m2_f = 0.0
+    mean_ph = 0.0
+    m2_ph = 0.0
+
+    for i in range(n):
+        ph = (time[i] - t0) * inv_p
+        ph = ph - np.floor(ph)
+        # Branchless centered test: min(ph, 1-ph) < duty is equivalent to
+        # (ph < duty) | (ph > 1-duty) with a single compare per point
+        in_tr = min(ph, 1.0 - ph) < duty
+        if in_tr:
+            if not prev_in:
+                n_events += 1
+            n_in += 1
+            d = flux[i] - mean_f
+            mean_f += d / n_in
+            m2_f += d * (flux[i] - mean_f)
+            ph_days = ph * period
+            d = ph_days - mean_ph
+            mean_ph += d / n_in
+            m2_ph += d * (ph_days - mean_ph)
+        prev_in = in_tr
+
+    if n_in > 0:
+        depth_std = np.sqrt(m2_f / n_in)
+        phase_std = np.sqrt(m2_ph / n_in)
+    else:
+        depth_std = 0.0
+        phase_std = 0.0
+
+    return n_in, n_events, mean_f, depth_std, phase_std
+
+
+@njit(fastmath=True, cache=True)
+def per_transit_min_depth(time, flux, t0, period, n_transits, half_duration):
+    """
+    Per-transit minimum flux in one linear scan.
+
+    Each point is assigned to its nearest transit index
+    ``k = round((t - t0) / period)`` and, if it falls within
+    half_duration of that transit's center, updates the per-transit
+    minimum in place. Replaces the O(n_transits * n_points) pattern of
+    re-scanning the full time array once per transit.
+
+    Args:
+        time: Time array (days)
+        flux: Normalized flux array
+        t0: Mid-transit epoch of transit index 0
+        period: Transit period (days)
+        n_transits: Number of transit slots (indices 0..n_transits-1)
+        half_duration: Half the transit duration (days)
+
+    Returns:
+        Tuple of (min_flux, counts) arrays of length n_transits; slots
+        with no nearby points keep min_flux=inf and counts=0.
+    """
+    n = time.shape[0]
+    inv_p = 1.0 / period
+    min_flux = np.full(n_transits, np.inf)
+    counts = np.zeros(n_transits, dtype=np.int64)
+
+    for i in range(n):
+        k = int(np.floor((time[i] - t0) * inv_p + 0.5))
+        if k < 0 or k >= n_transits:
+            continue
+        t_transit = t0 + k * period
+        if abs(time[i] - t_transit) < half_duration:
+            counts[k] += 1
+            if flux[i] < min_flux[k]:
+                min_flux[k] = flux[i]
+
+    return min_flux, counts
+
+
+def run_bls(time, flux, periods, durations, n_bins=256):
+    """
+    Run the compiled BLS search and reduce to the single best fit.
+
+    No periodogram array survives the call — only the per-period best
+    arrays from the kernel, reduced here by argmax.
+
+    Returns:
+        Tuple of (power, period, t0, duration, depth) as floats.
+    """
+    power, t0, duration, depth = bls_power(
+        np.ascontiguousarray(time),
+        np.ascontiguousarray(flux),
+        np.ascontiguousarray(periods),
+        np.ascontiguousarray(durations),
+        n_bins,
+    )
+    best = int(np.argmax(power))
+    return (
+        float(power[best]),
+        float(periods[best]),
+        float(t0[best]),
+        float(duration[best]),
+        float(depth[best]),
+    )
@@ -13,12 +13,77 @@ from scipy import stats
 from statsmodels.tsa.stattools import adfuller
 from preprocessing.gap_handler import segment_light_curve, LightCurveSegment
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator so the module imports without numba."""
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rs_curve(flux, max_k):
+    """
+    Rescaled-range statistics for the Hurst exponent, one fused pass.
+
+    For each dyadic window size n = 2^k computes the mean R/S over all
+    full windows, accumulating the cumulative-deviation range and the
+    sample variance in a single sweep per window — no cumsum/max/min
+    temporaries. Returns (window_sizes, mean_RS), truncated to the
+    scales that produced at least one valid window.
+    """
+    n_scales = max_k - 2
+    ns = np.empty(n_scales)
+    rs_means = np.empty(n_scales)
+    idx = 0
+    for k in range(2, max_k):
+        n = 2 ** k
+        total = 0.0
+        count = 0
+        for i in range(0, flux.size - n, n):
+            mean_seg = 0.0
+            for j in range(n):
+                mean_seg += flux[i + j]
+            mean_seg /= n
+
+            cum = 0.0
+            cmax = -1e300
+            cmin = 1e300
+            ssq = 0.0
+            for j in range(n):
+                d = flux[i + j] - mean_seg
+                cum += d
+                if cum > cmax:
+                    cmax = cum
+                if cum < cmin:
+                    cmin = cum
+                ssq += d * d
+
+            S = np.sqrt(ssq / (n - 1))
+            if S > 0:
+                total += (cmax - cmin) / S
+                count += 1
+        if count > 0:
+            ns[idx] = n
+            rs_means[idx] = total / count
+            idx += 1
+    return ns[:idx], rs_means[:idx]
+
 
 def compute_autocorr_at_lag_segment_aware(
     flux: np.ndarray,
     time: np.ndarray,
     lag_points: int,
-    min_segment_points: int = 100
+    min_segment_points: int = 100,
+    time_diffs: np.ndarray = None,
+    cadence_median: float = None,
 ) -> float:
     """
     Compute autocorrelation at specific lag, handling gaps properly.
@@ -31,6 +96,9 @@ def compute_autocorr_at_lag_segment_aware(
         time: Time array
         lag_points: Lag in number of data points
         min_segment_points: Minimum points per segment
+        time_diffs: Precomputed np.diff(time) (optional; avoids
+            re-deriving it per lag when called several times per curve)
+        cadence_median: Precomputed median of time_diffs (optional)
 
     Returns:
         Weighted average autocorrelation coefficient
@@ -42,7 +110,9 @@ def compute_autocorr_at_lag_segment_aware(
     segments = segment_light_curve(
         flux, time,
         gap_threshold_multiplier=3.0,
-        min_segment_points=max(min_segment_points, lag_points + 10)
+        min_segment_points=max(min_segment_points, lag_points + 10),
+        time_diffs=time_diffs,
+        cadence_median=cadence_median,
     )
 
     if len(segments) == 0:
@@ -118,6 +188,13 @@ def compute_hurst_exponent(flux: np.ndarray) -> float:
     if max_k < 3:
         return 0.5
 
+    if NUMBA_AVAILABLE:
+        ns, rs_means = _rs_curve(np.ascontiguousarray(flux, dtype=np.float64), max_k)
+        if ns.size > 2:
+            slope, _ = np.polyfit(np.log(ns), np.log(rs_means), 1)
+            return float(np.clip(slope, 0, 1))
+        return 0.5
+
     RS_list = []
     n_list = []
 
@@ -185,7 +262,10 @@ def extract_temporal_features(
     validity['temp_duration_days'] = True
     validity['temp_n_points'] = True
 
-    # Cadence statistics
+    # Cadence statistics. time_diffs and cadence_median are also passed
+    # to every segment-aware autocorrelation call below, so the light
+    # curve is diffed and the median taken once instead of per lag.
+    time_diffs = None
     if n_points > 1:
         time_diffs = np.diff(time)
         features['temp_cadence_median'] = float(np.median(time_diffs))
@@ -208,7 +288,8 @@ def extract_temporal_features(
             lag_1hr_days = 1.0 / 24.0
             lag_1hr_points = max(1, int(lag_1hr_days / cadence_median))
             features['temp_autocorr_1hr'] = compute_autocorr_at_lag_segment_aware(
-                flux, time, lag_1hr_points, min_segment_points=50
+                flux, time, lag_1hr_points, min_segment_points=50,
+                time_diffs=time_diffs, cadence_median=cadence_median
             )
             validity['temp_autocorr_1hr'] = True
         else:
@@ -219,7 +300,8 @@ def extract_temporal_features(
         if n_points >= 100 and duration_days >= 7:
             lag_1day_points = max(1, int(1.0 / cadence_median))
             features['temp_autocorr_1day'] = compute_autocorr_at_lag_segment_aware(
-                flux, time, lag_1day_points, min_segment_points=100
+                flux, time, lag_1day_points, min_segment_points=100,
+                time_diffs=time_diffs, cadence_median=cadence_median
             )
             validity['temp_autocorr_1day'] = True
         else:
@@ -230,7 +312,8 @@ def extract_temporal_features(
         if n_points >= 500 and duration_days >= 30:
             lag_1week_points = max(1, int(7.0 / cadence_median))
             features['temp_autocorr_1week'] = compute_autocorr_at_lag_segment_aware(
-                flux, time, lag_1week_points, min_segment_points=500
+                flux, time, lag_1week_points, min_segment_points=500,
+                time_diffs=time_diffs, cadence_median=cadence_median
             )
             validity['temp_autocorr_1week'] = True
         else:
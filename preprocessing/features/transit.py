@@ -22,23 +22,59 @@ OPTIMIZATION 2026-01-18: NASA-style efficient pipeline
 - Binning/flattening applied uniformly to ALL stars for ML consistency
 """
 
+import functools
 import logging
+import math
+import os
 import signal
+import threading
 import numpy as np
-from typing import Dict, Tuple, Optional
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 from scipy.ndimage import median_filter
-from astropy.timeseries import BoxLeastSquares
+
+from preprocessing.features._bls_numba import (
+    NUMBA_AVAILABLE,
+    fold_and_reduce,
+    get_specialized_bls,
+    per_transit_min_depth,
+    run_bls,
+)
+
+# Optional NUFFT-based Lomb-Scargle prefilter (Press & Rybicki via
+# FINUFFT): orders of magnitude fewer FLOPs than a brute-force BLS grid
+# for the initial period search. The pipeline works without it.
+try:
+    import nifty_ls
+    NIFTY_LS_AVAILABLE = True
+except ImportError:
+    NIFTY_LS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 # Physical constants for planet radius validation
 R_JUPITER_R_EARTH = 11.2  # Jupiter radius in Earth radii
 R_SUN_R_EARTH = 109.1     # Solar radius in Earth radii
+R_SUN_PER_R_JUP = R_SUN_R_EARTH / R_JUPITER_R_EARTH  # Solar radius in Jupiter radii
 MAX_PLANET_R_JUPITER = 2.0  # Maximum plausible planet radius in R_Jupiter
 
 # BLS significance threshold (Gemini-validated)
 BLS_SIGNIFICANCE_THRESHOLD = 0.05
 
+# Flux MAD above which no planetary transit could be detected anyway
+# (planets dip ~0.0001-0.01; 5% scatter drowns any transit)
+MAD_NOISE_CEILING = 0.05
+
+# Coarse/fine BLS split: stars whose coarse-pass power falls this far
+# below the significance threshold skip the fine refinement entirely
+# (~99% of Kepler targets on realistic populations). The margin is on
+# the weighted SR^2 scale of the compiled kernel (bounded [0, 1]; noise
+# maxima at binned-curve point counts sit far below threshold), where a
+# denser grid can only nudge the peak slightly — re-measure the skip
+# rate on a validation batch before tightening or loosening it.
+BLS_REFINE_MARGIN = 0.01
+
 # NASA-style optimization parameters
 BLS_TIMEOUT_SEC = 60  # Hard timeout for BLS (guarantees progress)
 FLATTEN_WINDOW = 401  # ~8 days at 30-min cadence (removes stellar rotation)
@@ -47,6 +83,31 @@ MAX_SEGMENT_DAYS = 350.0  # Segment baseline for computational feasibility
 MAX_PERIOD_DAYS = 100.0  # 100-day cap: catches habitable zone candidates around M-dwarfs
 
 
+# All feature keys (5 core + 3 derived + 3 physical validation = 11 total)
+_ALL_FEATURE_KEYS = (
+    # Core BLS features (ALWAYS populated)
+    'transit_bls_power', 'transit_bls_period', 'transit_bls_depth',
+    'transit_bls_duration', 'transit_significant',
+    # Derived features (NULL if not significant)
+    'transit_n_detected', 'transit_depth_consistency', 'transit_timing_consistency',
+    # Physical validation features
+    'transit_implied_r_planet_rjup', 'transit_physically_plausible',
+    'transit_odd_even_consistent'
+)
+
+# Precomputed templates so failure paths are a cheap dict copy rather than
+# a per-call dict comprehension
+_NULL_FEATURES = {key: None for key in _ALL_FEATURE_KEYS}
+_NULL_VALIDITY = {key: False for key in _ALL_FEATURE_KEYS}
+
+
+def _null_result(timed_out: bool = False) -> Tuple[Dict[str, float], Dict[str, bool]]:
+    """Return the all-NULL (features, validity) pair shared by every BLS failure path."""
+    features = _NULL_FEATURES.copy()
+    features['_bls_timed_out'] = timed_out
+    return features, _NULL_VALIDITY.copy()
+
+
 class BLSTimeout(Exception):
     """Raised when BLS computation exceeds time limit."""
     pass
@@ -57,6 +118,341 @@ def _bls_timeout_handler(signum, frame):
     raise BLSTimeout("BLS computation timed out")
 
 
+def _get_bls():
+    """
+    Lazy accessor for astropy's BoxLeastSquares.
+
+    Importing astropy.timeseries at module top pulls in the whole
+    timeseries subpackage (plus erfa) — hundreds of ms per worker start.
+    The compiled kernel handles the hot path, so astropy is only loaded
+    on the fallback branch when numba is unavailable.
+    """
+    from astropy.timeseries import BoxLeastSquares
+    return BoxLeastSquares
+
+
+@functools.lru_cache(maxsize=64)
+def _build_period_grid_cached(
+    baseline_days: float,
+    min_period: float,
+    max_period: float,
+    min_duration: float,
+    frequency_factor: float,
+) -> np.ndarray:
+    """Construct the grid for _build_period_grid (memoized)."""
+    df = frequency_factor * min_duration / (baseline_days ** 2)
+    f_min = 1.0 / max_period
+    f_max = 1.0 / min_period
+    freqs = np.arange(f_min, f_max, df)
+    if len(freqs) == 0:
+        freqs = np.array([f_min])
+    periods = 1.0 / freqs[::-1]
+    # Cached copies are shared across calls (and threads) — freeze them
+    periods.setflags(write=False)
+    return periods
+
+
+def _build_period_grid(
+    baseline_days: float,
+    min_period: float,
+    max_period: float,
+    min_duration: float,
+    frequency_factor: float = 10.0,
+) -> np.ndarray:
+    """
+    Build the trial-period grid for the BLS search.
+
+    Matches astropy autoperiod spacing: uniform in frequency with
+    df = frequency_factor * min_duration / baseline**2.
+
+    Memoized: Kepler cadences and quarter lengths repeat across a batch
+    of targets, so autopower-style per-call grid construction rebuilds
+    the same array constantly. The baseline is quantized to 0.1-day bins
+    (and the period bounds to 1e-4 days) so repeated quarters hit the
+    cache. The returned array is read-only and shared — do not mutate.
+
+    Returns:
+        Periods in days, ascending from min_period.
+    """
+    return _build_period_grid_cached(
+        round(baseline_days, 1),
+        round(min_period, 4),
+        round(max_period, 4),
+        round(min_duration, 4),
+        frequency_factor,
+    )
+
+
+def _ls_candidate_periods(
+    time: np.ndarray,
+    flux: np.ndarray,
+    min_period: float,
+    max_period: float,
+    n_peaks: int = 5,
+    samples_per_peak: int = 5,
+) -> Optional[np.ndarray]:
+    """
+    NUFFT Lomb-Scargle prefilter for the BLS period search.
+
+    Two NUFFTs replace the brute-force sweep over every trial period;
+    BLS then only needs to evaluate narrow grids around the strongest
+    peaks.
+
+    Returns:
+        Up to n_peaks candidate periods (days, ascending), or None if
+        the prefilter failed (caller falls back to the full BLS grid).
+    """
+    try:
+        baseline = float(time[-1] - time[0])
+        f_min = 1.0 / max_period
+        f_max = 1.0 / min_period
+        n_freq = max(int(samples_per_peak * baseline * (f_max - f_min)), 4 * n_peaks)
+
+        result = nifty_ls.lombscargle(time, flux, fmin=f_min, fmax=f_max, Nf=n_freq)
+        power = np.asarray(result.power)
+        freqs = np.linspace(f_min, f_max, len(power))
+
+        n_peaks = min(n_peaks, len(power) - 1)
+        top = np.argpartition(-power, n_peaks)[:n_peaks]
+        return np.sort(1.0 / freqs[top])
+    except Exception as e:
+        logger.warning(f"Lomb-Scargle prefilter failed ({e}); using full BLS grid")
+        return None
+
+
+# Best-fit results keyed by a cheap O(1) fingerprint of the inputs.
+# Reprocessing the same light curve (detrending variants, sweeps) is a
+# pure recomputation of an expensive deterministic function, so a small
+# bounded cache skips the whole search. 8 entries covers the realistic
+# "few variants of the current star" working set without pinning memory.
+_BLS_RESULT_CACHE: Dict[tuple, Tuple[float, float, float, float, float]] = {}
+_BLS_RESULT_CACHE_MAX = 8
+# Segment BLS and the batch extractor both run in thread pools; dict
+# lookups are atomic but the evict-then-insert sequence is not, so
+# concurrent misses could race pop() into a KeyError
+_BLS_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _array_fingerprint(arr: np.ndarray) -> tuple:
+    """Cheap O(1) identity proxy for a light-curve array (not a full hash)."""
+    n = arr.shape[0]
+    return (n, float(arr[0]), float(arr[n // 2]), float(arr[-1]))
+
+
+def _bls_best_fit(
+    time: np.ndarray,
+    flux: np.ndarray,
+    min_period: float,
+    max_period: float,
+    durations: np.ndarray,
+) -> Tuple[float, float, float, float, float]:
+    """
+    Run the BLS period search and return the best-fit scalars.
+
+    Uses the compiled kernel in preprocessing.features._bls_numba when
+    numba is importable — astropy's autopower loop is Python-dispatched
+    per trial period and dominates per-star wall time. Falls back to
+    astropy's BoxLeastSquares otherwise.
+
+    Repeated calls on the same arrays and search bounds return the
+    memoized scalars (only the 5 best-fit values are cached, never a
+    periodogram array).
+
+    Returns:
+        Tuple of (power, period, t0, duration, depth) as floats.
+    """
+    # Duration endpoints matter, not just the count: grids built from
+    # different stellar radii can share a length while spanning
+    # different durations, and must not alias to the same entry
+    cache_key = (
+        _array_fingerprint(time),
+        _array_fingerprint(flux),
+        round(float(min_period), 6),
+        round(float(max_period), 6),
+        round(float(durations[0]), 6),
+        round(float(durations[-1]), 6),
+        len(durations),
+    )
+    with _BLS_RESULT_CACHE_LOCK:
+        cached = _BLS_RESULT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _bls_best_fit_uncached(time, flux, min_period, max_period, durations)
+
+    with _BLS_RESULT_CACHE_LOCK:
+        if len(_BLS_RESULT_CACHE) >= _BLS_RESULT_CACHE_MAX:
+            _BLS_RESULT_CACHE.pop(next(iter(_BLS_RESULT_CACHE)))
+        _BLS_RESULT_CACHE[cache_key] = result
+    return result
+
+
+def _bls_best_fit_uncached(
+    time: np.ndarray,
+    flux: np.ndarray,
+    min_period: float,
+    max_period: float,
+    durations: np.ndarray,
+) -> Tuple[float, float, float, float, float]:
+    """
+    Actually run the search (see _bls_best_fit for the cached entry point).
+
+    Two-stage strategy: a coarse pass over the full period range first;
+    only stars whose coarse power comes near the significance threshold
+    get a 5x denser refinement pass, constrained to ±10% of the coarse
+    period. Quiet stars — the vast majority — pay for one coarse pass
+    only.
+    """
+    def _search(lo: float, hi: float, frequency_factor: float):
+        if NUMBA_AVAILABLE:
+            baseline_days = float(time[-1] - time[0])
+            periods = _build_period_grid(
+                baseline_days, lo, hi, float(durations[0]), frequency_factor
+            )
+            if frequency_factor == 10.0:
+                # Coarse pass: the full-range grid depends only on cadence
+                # and baseline, so dispatch through the entry point
+                # specialized for this cadence class (the refinement grid
+                # below is candidate-specific and cannot be specialized)
+                cadence_minutes = float(time[1] - time[0]) * 1440.0
+                kernel = get_specialized_bls(
+                    cadence_minutes, baseline_days, periods, durations
+                )
+                return kernel(time, flux)
+            return run_bls(time, flux, periods, durations)
+
+        model = _get_bls()(time, flux)
+        periodogram = model.autopower(
+            durations,
+            minimum_period=lo,
+            maximum_period=hi,
+            frequency_factor=frequency_factor,
+        )
+        best_idx = np.argmax(periodogram.power)
+        return (
+            float(periodogram.power[best_idx]),
+            float(periodogram.period[best_idx]),
+            float(periodogram.transit_time[best_idx]),
+            float(periodogram.duration[best_idx]),
+            float(periodogram.depth[best_idx]),
+        )
+
+    # NUFFT prefilter path: a Lomb-Scargle pass pins down candidate
+    # periods, then BLS evaluates only narrow grids around the top peaks
+    if NIFTY_LS_AVAILABLE and NUMBA_AVAILABLE:
+        candidates = _ls_candidate_periods(time, flux, min_period, max_period)
+        if candidates is not None and len(candidates) > 0:
+            grids = [
+                np.linspace(max(min_period, 0.95 * p), min(max_period, 1.05 * p), 50)
+                for p in candidates
+            ]
+            periods = np.unique(np.concatenate(grids))
+            return run_bls(time, flux, periods, durations)
+
+    # Coarse pass (frequency_factor=10.0: not too sparse, misses nothing
+    # wider than a narrow transit)
+    coarse = _search(min_period, max_period, 10.0)
+
+    if coarse[0] < BLS_SIGNIFICANCE_THRESHOLD - BLS_REFINE_MARGIN:
+        return coarse
+
+    # Candidate: refine on a denser grid around the coarse period
+    refine_lo = max(min_period, 0.9 * coarse[1])
+    refine_hi = min(max_period, 1.1 * coarse[1])
+    if refine_hi <= refine_lo:
+        return coarse
+
+    fine = _search(refine_lo, refine_hi, 2.0)
+    return fine if fine[0] >= coarse[0] else coarse
+
+
+def _duration_grid(
+    min_period: float,
+    max_period: float,
+    st_rad: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Build the trial transit-duration grid for a BLS search.
+
+    Without a stellar radius the historical 15-point grid over
+    0.04-0.5 days is returned. With one, most of that grid is
+    physically impossible: the expected duration for a central transit
+    scales as 13 hr * (P / 1 yr)^(1/3) * rho_star^(-1/3), and with the
+    main-sequence approximation M ~ R that density term reduces to
+    R^(2/3). Five trial durations bracketing the analytic estimate at
+    the geometric-mean period cover the plausible range at a third of
+    the periodogram cost (BLS time is linear in the duration count).
+
+    Args:
+        min_period: Shortest trial period (days)
+        max_period: Longest trial period (days)
+        st_rad: Stellar radius in solar radii (optional)
+
+    Returns:
+        Array of trial durations (days), ascending
+    """
+    max_transit_duration = min(0.5, min_period * 0.8)
+
+    if st_rad is None or not math.isfinite(st_rad) or st_rad <= 0:
+        return np.linspace(0.04, max_transit_duration, 15)
+
+    p_mid = math.sqrt(min_period * max_period)
+    t_est = (13.0 / 24.0) * (p_mid / 365.25) ** (1.0 / 3.0) * st_rad ** (2.0 / 3.0)
+
+    lo = max(0.02, 0.5 * t_est)
+    hi = min(max_transit_duration, 1.5 * t_est)
+    if hi <= lo:
+        # Estimate fell outside the searchable range (e.g. giant host);
+        # fall back to the broad grid rather than search nothing
+        return np.linspace(0.04, max_transit_duration, 15)
+
+    return np.linspace(lo, hi, 5)
+
+
+def _run_segment_bls(
+    time_seg: np.ndarray,
+    flux_seg: np.ndarray,
+    cadence: float,
+    st_rad: Optional[float] = None,
+) -> Optional[Tuple[float, float, float, float, float]]:
+    """
+    Run BLS on a single continuous segment.
+
+    Args:
+        time_seg: Segment time array (days)
+        flux_seg: Segment flux array
+        cadence: Median cadence of the BLS input (days), computed once by
+            the caller and shared across segments
+        st_rad: Stellar radius in solar radii (optional; narrows the
+            duration grid to physically plausible values)
+
+    Returns:
+        Tuple of (power, period, t0, duration, depth) at the peak of the
+        periodogram, or None if the segment is unusable or BLS failed.
+    """
+    if len(time_seg) < 100:
+        return None
+
+    seg_baseline = time_seg[-1] - time_seg[0]
+
+    # Period range for this segment
+    min_period = max(0.5, 2 * cadence)
+    seg_max_period = seg_baseline / 3.0  # At least 3 transits in segment
+    max_period = min(seg_max_period, MAX_PERIOD_DAYS)
+
+    if max_period <= min_period:
+        return None
+
+    # Duration search
+    durations = _duration_grid(min_period, max_period, st_rad)
+
+    try:
+        return _bls_best_fit(time_seg, flux_seg, min_period, max_period, durations)
+    except Exception as e:
+        logger.warning(f"  Segment BLS failed: {e}")
+        return None
+
+
 def extract_transit_features(
     flux: np.ndarray,
     time: np.ndarray,
@@ -105,26 +501,47 @@ def extract_transit_features(
     validity = {}
 
     n_points = len(flux)
-    duration = time[-1] - time[0]
-
-    # All feature keys (5 core + 3 derived + 3 physical validation = 11 total)
-    all_feature_keys = [
-        # Core BLS features (ALWAYS populated)
-        'transit_bls_power', 'transit_bls_period', 'transit_bls_depth',
-        'transit_bls_duration', 'transit_significant',
-        # Derived features (NULL if not significant)
-        'transit_n_detected', 'transit_depth_consistency', 'transit_timing_consistency',
-        # Physical validation features
-        'transit_implied_r_planet_rjup', 'transit_physically_plausible',
-        'transit_odd_even_consistent'
-    ]
+    # Baseline and cadence are computed once and reused everywhere below —
+    # np.median(np.diff(...)) allocates N-1 floats and does an O(N log N)
+    # partition, so it should not be repeated per segment
+    baseline = float(time[-1] - time[0])
 
     # Check minimum requirements
-    if n_points < 500 or duration < 30:
-        for key in all_feature_keys:
-            features[key] = None
-            validity[key] = False
-        features['_bls_timed_out'] = False  # Not a timeout, just insufficient data
+    if n_points < 500 or baseline < 30:
+        # Not a timeout, just insufficient data
+        return _null_result()
+
+    # Cheap noise triage BEFORE the expensive flatten+bin+BLS pipeline:
+    # if the flux scatter is above any plausible transit depth, BLS cannot
+    # reach significance, so skip straight to the "not significant" result.
+    # Saves the full 60-second BLS budget on hopelessly noisy targets.
+    flux_median = np.median(flux)
+    mad = np.median(np.abs(flux - flux_median))
+    if mad > MAD_NOISE_CEILING:
+        logger.info(f"BLS skipped: MAD={mad:.4f} > {MAD_NOISE_CEILING} (too noisy for any transit)")
+        features['transit_bls_power'] = 0.0
+        features['transit_bls_period'] = 0.0
+        features['transit_bls_depth'] = 0.0
+        features['transit_bls_duration'] = 0.0
+        features['transit_significant'] = 0.0
+        features['transit_n_detected'] = 0
+        features['transit_depth_consistency'] = None
+        features['transit_timing_consistency'] = None
+        features['transit_implied_r_planet_rjup'] = None
+        features['transit_physically_plausible'] = None
+        features['transit_odd_even_consistent'] = None
+        validity['transit_bls_power'] = True
+        validity['transit_bls_period'] = True
+        validity['transit_bls_depth'] = True
+        validity['transit_bls_duration'] = True
+        validity['transit_significant'] = True
+        validity['transit_n_detected'] = True  # 0 is a valid value
+        validity['transit_depth_consistency'] = False
+        validity['transit_timing_consistency'] = False
+        validity['transit_implied_r_planet_rjup'] = False
+        validity['transit_physically_plausible'] = False
+        validity['transit_odd_even_consistent'] = False
+        features['_bls_timed_out'] = False
         return features, validity
 
     try:
@@ -151,7 +568,7 @@ def extract_transit_features(
         from scipy.stats import binned_statistic
 
         bin_size_days = BIN_SIZE_HOURS / 24.0
-        n_bins = int((time[-1] - time[0]) / bin_size_days)
+        n_bins = int(baseline / bin_size_days)
 
         if n_bins > 100:  # Only bin if we have enough data
             bin_edges = np.linspace(time[0], time[-1], n_bins + 1)
@@ -175,6 +592,20 @@ def extract_transit_features(
             flux_bls = flux_flat
             logger.info(f"BLS preprocessing: {n_points} points (flattened only, too short to bin)")
 
+        # STEP 3: Downcast to float32 for the BLS search
+        # BLS power is a noisy statistic (depth ~1e-3 vs ~1e-4 noise floor),
+        # so ~7 significant digits are plenty. Halves memory bandwidth on the
+        # folded arrays and doubles SIMD lane count in the inner loop.
+        # Subtract the epoch BEFORE casting: raw BJDs (~2.4e6 days) would lose
+        # sub-cadence precision in single precision.
+        time_bls_epoch = float(time_bls[0])
+        time_bls = (time_bls - time_bls_epoch).astype(np.float32, copy=False)
+        flux_bls = flux_bls.astype(np.float32, copy=False)
+
+        # Median cadence of the (binned) BLS input — shared by every
+        # segment below instead of re-deriving it per segment
+        cadence_bls = float(np.median(np.diff(time_bls)))
+
         # ================================================================
         # SEGMENTED BLS TRANSIT SEARCH
         # ================================================================
@@ -192,118 +623,77 @@ def extract_transit_features(
 
             logger.info(f"BLS: {baseline_days:.0f}-day baseline → {n_segments} segments of ~{MAX_SEGMENT_DAYS:.0f} days")
 
-            best_power = 0.0
-            best_period = 0.0
-            best_t0 = 0.0
-            best_duration = 0.0
-            best_depth = 0.0
-
+            segment_slices = []
             for seg_idx in range(n_segments):
                 start_idx = seg_idx * segment_size
                 end_idx = start_idx + segment_size if seg_idx < n_segments - 1 else len(time_bls)
-
-                time_seg = time_bls[start_idx:end_idx]
-                flux_seg = flux_bls[start_idx:end_idx]
-
-                if len(time_seg) < 100:
+                segment_slices.append((start_idx, end_idx))
+
+            # Segments are independent — run them concurrently. astropy's BLS
+            # kernel does its heavy lifting in compiled code, so a small
+            # thread pool overlaps the segments instead of 4 × ~13s serially.
+            with ThreadPoolExecutor(max_workers=n_segments) as executor:
+                results = list(executor.map(
+                    lambda bounds: _run_segment_bls(
+                        time_bls[bounds[0]:bounds[1]],
+                        flux_bls[bounds[0]:bounds[1]],
+                        cadence_bls,
+                        st_rad,
+                    ),
+                    segment_slices,
+                ))
+
+            best = None
+            for seg_idx, result in enumerate(results):
+                if result is None:
                     continue
+                n_seg_points = segment_slices[seg_idx][1] - segment_slices[seg_idx][0]
+                logger.info(f"  Segment {seg_idx+1}/{n_segments}: {n_seg_points} pts, power={result[0]:.4f}")
+                if best is None or result[0] > best[0]:
+                    best = result
 
-                seg_baseline = time_seg[-1] - time_seg[0]
-
-                # Period range for this segment
-                min_period = max(0.5, 2 * np.median(np.diff(time_seg)))
-                seg_max_period = seg_baseline / 3.0  # At least 3 transits in segment
-                max_period = min(seg_max_period, MAX_PERIOD_DAYS)
-
-                if max_period <= min_period:
-                    continue
-
-                # Duration search
-                max_transit_duration = min(0.5, min_period * 0.8)
-                durations = np.linspace(0.04, max_transit_duration, 15)
-
-                try:
-                    model = BoxLeastSquares(time_seg, flux_seg)
-                    periodogram = model.autopower(
-                        durations,
-                        minimum_period=min_period,
-                        maximum_period=max_period,
-                        frequency_factor=10.0,  # Balanced: not too sparse (misses narrow transits)
-                    )
-
-                    seg_power = np.max(periodogram.power)
-                    logger.info(f"  Segment {seg_idx+1}/{n_segments}: {len(time_seg)} pts, {seg_baseline:.0f}d, power={seg_power:.4f}")
-
-                    if seg_power > best_power:
-                        best_power = seg_power
-                        best_period = periodogram.period[np.argmax(periodogram.power)]
-                        best_t0 = periodogram.transit_time[np.argmax(periodogram.power)]
-                        best_duration = periodogram.duration[np.argmax(periodogram.power)]
-                        best_depth = periodogram.depth[np.argmax(periodogram.power)]
-
-                except Exception as e:
-                    logger.warning(f"  Segment {seg_idx+1} BLS failed: {e}")
-                    continue
-
-            power = best_power
-            period = best_period
-            t0 = best_t0
-            duration_result = best_duration
-            depth = best_depth
-            features['_bls_timed_out'] = False
-
-            if power == 0.0:
+            if best is None:
                 # All segments failed
                 logger.error("BLS: All segments failed")
-                for key in all_feature_keys:
-                    features[key] = None
-                    validity[key] = False
-                features['_bls_timed_out'] = False
-                return features, validity
+                return _null_result()
+
+            power, period, t0, duration_result, depth = best
+            features['_bls_timed_out'] = False
 
         else:
             # Short baseline: run BLS on full data
-            model = BoxLeastSquares(time_bls, flux_bls)
-
-            min_period = max(0.5, 2 * np.median(np.diff(time_bls)))
+            min_period = max(0.5, 2 * cadence_bls)
             data_max_period = baseline_days / 3.0
             max_period = min(data_max_period, MAX_PERIOD_DAYS)
 
             logger.info(f"BLS: Searching periods {min_period:.1f}-{max_period:.1f} days ({len(flux_bls)} points)")
 
-            max_transit_duration = min(0.5, min_period * 0.8)
-            durations = np.linspace(0.04, max_transit_duration, 15)
+            durations = _duration_grid(min_period, max_period, st_rad)
 
             try:
-                periodogram = model.autopower(
-                    durations,
-                    minimum_period=min_period,
-                    maximum_period=max_period,
-                    frequency_factor=10.0,  # Balanced: not too sparse (misses narrow transits)
+                power, period, t0, duration_result, depth = _bls_best_fit(
+                    time_bls, flux_bls, min_period, max_period, durations
                 )
                 features['_bls_timed_out'] = False
             except Exception as e:
-                logger.error(f"BLS autopower failed: {e}")
-                for key in all_feature_keys:
-                    features[key] = None
-                    validity[key] = False
-                features['_bls_timed_out'] = False
-                return features, validity
-
-            period = periodogram.period[np.argmax(periodogram.power)]
-            power = np.max(periodogram.power)
-            t0 = periodogram.transit_time[np.argmax(periodogram.power)]
-            duration_result = periodogram.duration[np.argmax(periodogram.power)]
-            depth = periodogram.depth[np.argmax(periodogram.power)]
-
-        # Rename for clarity below (avoid shadowing 'duration' input parameter)
-        duration = duration_result
+                logger.error(f"BLS search failed: {e}")
+                return _null_result()
+
+        # Promote BLS outputs back to float64 and restore the time epoch.
+        # Downstream consistency checks compare against the original float64
+        # `time` array, so t0 must be back in absolute BJD. The transit
+        # duration gets its own name — it must never shadow the baseline.
+        power = float(power)
+        period = float(period)
+        transit_dur = float(duration_result)
+        depth = float(depth)
+        t0 = float(t0) + time_bls_epoch
 
         # CORE BLS FEATURES - Always populated (Gemini requirement)
         features['transit_bls_power'] = float(power)
         features['transit_bls_period'] = float(period)
         features['transit_bls_depth'] = float(abs(depth))
-        features['transit_bls_duration'] = float(duration)
+        features['transit_bls_duration'] = transit_dur
         validity['transit_bls_power'] = True
         validity['transit_bls_period'] = True
         validity['transit_bls_depth'] = True
@@ -335,31 +725,30 @@ def extract_transit_features(
             features['_bls_timed_out'] = False  # Completed successfully
             return features, validity
 
-        # Count number of transits detected
-        # Fold at best period and look for consistent dips
-        n_transits = int(duration / period)
-        features['transit_n_detected'] = max(0, n_transits)
+        # Fused phase-fold + in-transit reductions: a single compiled pass
+        # over time/flux feeds the transit count, depth-consistency and
+        # timing-consistency blocks below (previously four numpy passes
+        # with two temporary arrays)
+        duty = transit_dur / period
+        n_in_transit, n_transits, depth_mean, depth_std, phase_residual_days = fold_and_reduce(
+            time, flux, float(t0), float(period), float(duty)
+        )
+        n_in_transit = int(n_in_transit)
+
+        # Count of detected transits: separate runs of in-transit points
+        # in time order (ingress events)
+        features['transit_n_detected'] = int(n_transits)
         validity['transit_n_detected'] = True
 
         # SCIENTIFIC VALIDATION: Physical plausibility check
         # Calculate implied planet radius from transit depth and stellar radius
         # If R_planet > 2.0 R_Jupiter, it's likely an eclipsing binary, not a planet
         if st_rad is not None and st_rad > 0 and abs(depth) > 0:
-            # Transit depth δ = (R_p / R_*)^2
-            # R_p / R_* = sqrt(δ)
-            # R_p = R_* × sqrt(δ) × R_sun_in_R_earth / R_jup_in_R_earth
-
-            # Depth is in flux units (fraction), typically ~0.001-0.01 for planets
-            transit_depth_fraction = abs(depth)
-
-            # R_planet / R_star = sqrt(depth)
-            r_planet_over_r_star = np.sqrt(transit_depth_fraction)
-
-            # R_planet in Earth radii
-            r_planet_r_earth = r_planet_over_r_star * st_rad * R_SUN_R_EARTH
-
-            # R_planet in Jupiter radii
-            r_planet_r_jupiter = r_planet_r_earth / R_JUPITER_R_EARTH
+            # Transit depth δ = (R_p / R_*)^2, so R_p = R_* × sqrt(δ).
+            # Depth is in flux units (fraction), typically ~0.001-0.01 for
+            # planets. math.sqrt avoids numpy ufunc dispatch on a scalar,
+            # and the unit conversion is one precomputed constant.
+            r_planet_r_jupiter = math.sqrt(abs(depth)) * st_rad * R_SUN_PER_R_JUP
 
             features['transit_implied_r_planet_rjup'] = float(r_planet_r_jupiter)
             validity['transit_implied_r_planet_rjup'] = True
@@ -379,54 +768,43 @@ def extract_transit_features(
             validity['transit_physically_plausible'] = False
 
         # Transit depth consistency
-        # Phase fold and measure depth variation
-        try:
-            phase = ((time - t0) % period) / period
-            in_transit = (phase < duration / period) | (phase > 1 - duration / period)
-
-            if np.sum(in_transit) > 5:
-                transit_depths = flux[in_transit]
-                depth_std = np.std(transit_depths)
-                depth_mean = np.mean(transit_depths)
-
-                if abs(depth_mean) > 0:
-                    features['transit_depth_consistency'] = float(depth_std / abs(depth_mean))
-                else:
-                    features['transit_depth_consistency'] = 0.0
+        # Measure depth variation across the folded in-transit points.
+        # Precondition branches replace the old per-block try/except: the
+        # scalar arithmetic below cannot raise for valid inputs, and the
+        # outer handler still catches anything genuinely unexpected.
+        if n_in_transit > 5:
+            if abs(depth_mean) > 0:
+                features['transit_depth_consistency'] = float(depth_std / abs(depth_mean))
             else:
-                features['transit_depth_consistency'] = None
-                validity['transit_depth_consistency'] = False
-
+                features['transit_depth_consistency'] = 0.0
             validity['transit_depth_consistency'] = True
-        except Exception:
+        else:
             features['transit_depth_consistency'] = None
             validity['transit_depth_consistency'] = False
 
+        # Expected transit times from the BLS ephemeris — computed once and
+        # shared by the timing-consistency and odd-even blocks below.
+        # Window bounds are applied arithmetically: the valid orbit indices
+        # are k_min..k_max, so the array is allocated at exactly the needed
+        # size instead of building the full grid and boolean-masking it.
+        k_min = max(0, int(np.ceil((time[0] - t0) / period)))
+        k_max = int(np.floor((time[-1] - t0) / period))
+        if k_max >= k_min:
+            expected_times = t0 + np.arange(k_min, k_max + 1) * period
+        else:
+            expected_times = np.empty(0)
+        n_transit_slots = k_max + 1  # orbit indices 0..k_max
+
         # Transit timing consistency (TTV measure)
         # Measure deviations from predicted transit times
-        try:
-            # Find individual transit events
-            transit_mask = in_transit.copy()
-
-            # Expected transit times
-            n_expected = int((time[-1] - t0) / period)
-            expected_times = t0 + np.arange(n_expected + 1) * period
-            expected_times = expected_times[
-                (expected_times >= time[0]) & (expected_times <= time[-1])
-            ]
-
-            if len(expected_times) > 2:
-                # This is a simplified TTV - full calculation requires
-                # fitting each transit individually
-                # For now, use RMS of phase jitter as proxy
-                phase_residual = np.std((time[in_transit] - t0) % period)
-                features['transit_timing_consistency'] = float(phase_residual * 24 * 60)  # minutes
-            else:
-                features['transit_timing_consistency'] = None
-                validity['transit_timing_consistency'] = False
-
+        if len(expected_times) > 2:
+            # This is a simplified TTV - full calculation requires
+            # fitting each transit individually
+            # For now, use RMS of phase jitter as proxy
+            # (already reduced in the fused fold_and_reduce pass above)
+            features['transit_timing_consistency'] = float(phase_residual_days * 24 * 60)  # minutes
             validity['transit_timing_consistency'] = True
-        except Exception:
+        else:
             features['transit_timing_consistency'] = None
             validity['transit_timing_consistency'] = False
 
@@ -434,58 +812,53 @@ def extract_transit_features(
         # Eclipsing binaries have alternating transit depths because two stars
         # of different sizes/temperatures are involved. Planets produce
         # consistent depths.
-        try:
-            # Get transit times based on period and t0
-            n_transits_expected = int((time[-1] - t0) / period)
-            transit_times = t0 + np.arange(n_transits_expected + 1) * period
-            transit_times = transit_times[
-                (transit_times >= time[0]) & (transit_times <= time[-1])
-            ]
+        # Transit times from the shared BLS ephemeris above
+        transit_times = expected_times
+
+        if len(transit_times) >= 4:  # Need at least 2 odd and 2 even
+            # One compiled linear scan assigns each point to its
+            # nearest transit and tracks per-transit minimum flux —
+            # previously an O(n_transits × n_points) Python loop that
+            # re-scanned the full time array once per transit
+            min_flux, slot_counts = per_transit_min_depth(
+                time, flux, float(t0), float(period),
+                n_transit_slots, float(transit_dur * 0.5)
+            )
 
-            if len(transit_times) >= 4:  # Need at least 2 odd and 2 even
-                odd_depths = []
-                even_depths = []
-
-                for i, t_transit in enumerate(transit_times):
-                    # Find points near this transit
-                    transit_mask = np.abs(time - t_transit) < duration * 0.5
-                    if np.sum(transit_mask) >= 3:
-                        transit_flux = flux[transit_mask]
-                        # Depth = 1 - min(flux) for dipping transits
-                        transit_depth = 1.0 - np.min(transit_flux)
-
-                        if i % 2 == 0:
-                            even_depths.append(transit_depth)
-                        else:
-                            odd_depths.append(transit_depth)
-
-                if len(odd_depths) >= 2 and len(even_depths) >= 2:
-                    odd_mean = np.mean(odd_depths)
-                    even_mean = np.mean(even_depths)
-                    all_depths = odd_depths + even_depths
-                    depth_std = np.std(all_depths)
-
-                    if depth_std > 0:
-                        # Difference in sigmas
-                        diff_sigma = abs(odd_mean - even_mean) / depth_std
-
-                        # If difference > 3 sigma, likely eclipsing binary
-                        if diff_sigma <= 3.0:
-                            features['transit_odd_even_consistent'] = 1.0  # Consistent = planet
-                        else:
-                            features['transit_odd_even_consistent'] = 0.0  # Inconsistent = binary
-                        validity['transit_odd_even_consistent'] = True
+            odd_depths = []
+            even_depths = []
+            for k in range(n_transit_slots):
+                if slot_counts[k] >= 3:
+                    # Depth = 1 - min(flux) for dipping transits
+                    transit_depth = 1.0 - min_flux[k]
+                    if k % 2 == 0:
+                        even_depths.append(transit_depth)
                     else:
-                        features['transit_odd_even_consistent'] = 1.0  # No variation = consistent
-                        validity['transit_odd_even_consistent'] = True
+                        odd_depths.append(transit_depth)
+
+            if len(odd_depths) >= 2 and len(even_depths) >= 2:
+                odd_mean = np.mean(odd_depths)
+                even_mean = np.mean(even_depths)
+                all_depths = odd_depths + even_depths
+                depth_std = np.std(all_depths)
+
+                if depth_std > 0:
+                    # Difference in sigmas
+                    diff_sigma = abs(odd_mean - even_mean) / depth_std
+
+                    # If difference > 3 sigma, likely eclipsing binary
+                    if diff_sigma <= 3.0:
+                        features['transit_odd_even_consistent'] = 1.0  # Consistent = planet
+                    else:
+                        features['transit_odd_even_consistent'] = 0.0  # Inconsistent = binary
+                    validity['transit_odd_even_consistent'] = True
                 else:
-                    features['transit_odd_even_consistent'] = None
-                    validity['transit_odd_even_consistent'] = False
+                    features['transit_odd_even_consistent'] = 1.0  # No variation = consistent
+                    validity['transit_odd_even_consistent'] = True
             else:
                 features['transit_odd_even_consistent'] = None
                 validity['transit_odd_even_consistent'] = False
-        except Exception as e:
-            logger.warning(f"Odd-even consistency check failed: {e}")
+        else:
             features['transit_odd_even_consistent'] = None
             validity['transit_odd_even_consistent'] = False
 
@@ -496,9 +869,60 @@ def extract_transit_features(
         # If BLS fails entirely, still try to return zeros for core features
         # so the model sees "BLS ran but found nothing" vs "BLS couldn't run"
         logger.error(f"BLS extraction failed: {type(e).__name__}: {e}")
-        for key in all_feature_keys:
-            features[key] = None
-            validity[key] = False
-        features['_bls_timed_out'] = False  # Not a timeout, just an error
+        return _null_result()  # Not a timeout, just an error
 
     return features, validity
+
+
+def extract_transit_features_batch(
+    fluxes: List[np.ndarray],
+    times: List[np.ndarray],
+    st_rads: Optional[List[Optional[float]]] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Extract transit features for a batch of light curves in one call.
+
+    Amortizes per-call overhead when driving the pipeline over many
+    targets: output columns are preallocated as typed numpy arrays and
+    written by index (no per-target dict churn), and targets run
+    concurrently in a thread pool since the BLS work happens in
+    compiled code.
+
+    Args:
+        fluxes: List of normalized flux arrays, one per target
+        times: List of time arrays (BJD, days), one per target
+        st_rads: Optional list of stellar radii (solar radii) per target
+        max_workers: Thread pool size (defaults to CPU count)
+
+    Returns:
+        DataFrame with one row per target: float64 columns for the 11
+        transit features, bool `<feature>_valid` columns for validity,
+        and a bool `_bls_timed_out` column.
+    """
+    n_targets = len(fluxes)
+    if st_rads is None:
+        st_rads = [None] * n_targets
+
+    # Preallocate typed output columns once for the whole batch
+    feature_cols = {key: np.full(n_targets, np.nan) for key in _ALL_FEATURE_KEYS}
+    validity_cols = {f'{key}_valid': np.zeros(n_targets, dtype=bool) for key in _ALL_FEATURE_KEYS}
+    timed_out = np.zeros(n_targets, dtype=bool)
+
+    def _extract_one(idx: int):
+        features, validity = extract_transit_features(
+            fluxes[idx], times[idx], st_rad=st_rads[idx]
+        )
+        return idx, features, validity
+
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for idx, features, validity in executor.map(_extract_one, range(n_targets)):
+            for key in _ALL_FEATURE_KEYS:
+                value = features.get(key)
+                if value is not None:
+                    feature_cols[key][idx] = value
+                validity_cols[f'{key}_valid'][idx] = bool(validity.get(key, False))
+            timed_out[idx] = bool(features.get('_bls_timed_out', False))
+
+    return pd.DataFrame({**feature_cols, **validity_cols, '_bls_timed_out': timed_out})
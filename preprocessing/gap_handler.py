@@ -14,25 +14,109 @@ This module provides robust gap detection and segment-based processing.
 """
 
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator so the module imports without numba."""
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
 
 @dataclass
 class LightCurveSegment:
-    """A continuous segment of a light curve (no large gaps)."""
-    flux: np.ndarray
-    time: np.ndarray
+    """
+    A continuous segment of a light curve (no large gaps).
+
+    Stores only the parent arrays plus [start_idx, end_idx) — flux/time
+    are zero-copy NumPy views, so segmenting a 4-year Kepler curve into
+    ~17 quarters no longer duplicates every point. Callers must not
+    mutate the views in place; use materialize() for an owned copy.
+    """
+    parent_flux: np.ndarray
+    parent_time: np.ndarray
     start_idx: int
     end_idx: int
-    duration_days: float
-    n_points: int
+
+    @property
+    def flux(self) -> np.ndarray:
+        return self.parent_flux[self.start_idx:self.end_idx]
+
+    @property
+    def time(self) -> np.ndarray:
+        return self.parent_time[self.start_idx:self.end_idx]
+
+    @property
+    def n_points(self) -> int:
+        return self.end_idx - self.start_idx
+
+    @property
+    def duration_days(self) -> float:
+        return float(self.parent_time[self.end_idx - 1] - self.parent_time[self.start_idx])
+
+    def materialize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return owned (flux, time) copies for code that needs to mutate."""
+        return self.flux.copy(), self.time.copy()
+
+
+@njit(cache=True)
+def _scan_segment_bounds(time, gap_threshold, min_segment_points):
+    """
+    Single-pass segment boundary scan.
+
+    Walks the time array once, emitting [start, end) index pairs for
+    every run of consecutive points whose spacing stays at or below
+    gap_threshold. Fuses the diff/compare/where/boundary steps into one
+    sweep with no temporary arrays beyond the output.
+    """
+    n = time.shape[0]
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    k = 0
+    seg_start = 0
+    for i in range(1, n):
+        if time[i] - time[i - 1] > gap_threshold:
+            if i - seg_start >= min_segment_points:
+                starts[k] = seg_start
+                ends[k] = i
+                k += 1
+            seg_start = i
+    if n - seg_start >= min_segment_points:
+        starts[k] = seg_start
+        ends[k] = n
+        k += 1
+    return starts[:k], ends[:k]
+
+
+def _fast_median(x: np.ndarray) -> float:
+    """
+    Median via np.partition (O(N) nth-element) instead of a full sort.
+
+    Equivalent to np.median for 1-D input; worth it on the ~65k-point
+    diff arrays this module sees per light curve.
+    """
+    mid = x.size // 2
+    if x.size % 2 == 0:
+        part = np.partition(x, (mid - 1, mid))
+        return 0.5 * (part[mid - 1] + part[mid])
+    return float(np.partition(x, mid)[mid])
 
 
 def detect_gaps(
     time: np.ndarray,
     cadence_median: float,
-    gap_threshold_multiplier: float = 3.0
+    gap_threshold_multiplier: float = 3.0,
+    time_diffs: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Detect large gaps in time series.
@@ -43,18 +127,29 @@ def detect_gaps(
         time: Time array (days)
         cadence_median: Median time between observations
         gap_threshold_multiplier: Gap threshold in units of cadence
+        time_diffs: Precomputed np.diff(time) (optional; avoids another
+            full pass over a multi-MB array when the caller already has it)
+        out: Preallocated bool buffer of at least len(time)-1 elements
+            (optional). Callers processing many curves can size one
+            buffer to their longest light curve and reuse it.
 
     Returns:
         Boolean array where True = gap detected after this index
+        (a view into `out` when one was supplied)
     """
     if len(time) < 2:
         return np.array([], dtype=bool)
 
-    time_diffs = np.diff(time)
+    if time_diffs is None:
+        time_diffs = np.diff(time)
     gap_threshold = gap_threshold_multiplier * cadence_median
 
     # Gap detected where time_diff > threshold
-    gaps = time_diffs > gap_threshold
+    if out is not None:
+        gaps = out[:time_diffs.size]
+        np.greater(time_diffs, gap_threshold, out=gaps)
+    else:
+        gaps = time_diffs > gap_threshold
 
     return gaps
 
@@ -63,7 +158,9 @@ def segment_light_curve(
     flux: np.ndarray,
     time: np.ndarray,
     gap_threshold_multiplier: float = 3.0,
-    min_segment_points: int = 50
+    min_segment_points: int = 50,
+    time_diffs: Optional[np.ndarray] = None,
+    cadence_median: Optional[float] = None
 ) -> List[LightCurveSegment]:
     """
     Break light curve into continuous segments at large gaps.
@@ -73,6 +170,13 @@ def segment_light_curve(
         time: Time array (days)
         gap_threshold_multiplier: Gap threshold in units of cadence
         min_segment_points: Minimum points to keep a segment
+        time_diffs: Precomputed np.diff(time) (optional)
+        cadence_median: Precomputed median cadence (optional)
+
+    Callers that segment the same light curve repeatedly (e.g. the
+    per-lag autocorrelation features) should compute time_diffs and
+    cadence_median once and pass them in — they are the only full-array
+    passes in here.
 
     Returns:
         List of LightCurveSegment objects
@@ -80,49 +184,54 @@ def segment_light_curve(
     if len(time) < 2:
         return []
 
-    # Compute median cadence
-    time_diffs = np.diff(time)
-    cadence_median = np.median(time_diffs)
-
-    # Detect gaps
-    gaps = detect_gaps(time, cadence_median, gap_threshold_multiplier)
-
-    # Find gap indices
-    gap_indices = np.where(gaps)[0] + 1  # +1 because gaps are after the index
-
-    # Create segment boundaries
-    boundaries = [0] + list(gap_indices) + [len(time)]
+    # Compute median cadence (once, unless the caller already did).
+    # With numba available and the cadence supplied, no diff array is
+    # built at all — the jitted sweep below works directly on `time`.
+    if cadence_median is None:
+        if time_diffs is None:
+            time_diffs = np.diff(time)
+        cadence_median = _fast_median(time_diffs)
 
-    # Build segments
-    segments = []
-    for i in range(len(boundaries) - 1):
-        start_idx = boundaries[i]
-        end_idx = boundaries[i + 1]
-
-        # Skip segments that are too short
-        if end_idx - start_idx < min_segment_points:
-            continue
-
-        seg_flux = flux[start_idx:end_idx]
-        seg_time = time[start_idx:end_idx]
+    gap_threshold = gap_threshold_multiplier * cadence_median
 
-        segment = LightCurveSegment(
-            flux=seg_flux,
-            time=seg_time,
-            start_idx=start_idx,
-            end_idx=end_idx,
-            duration_days=seg_time[-1] - seg_time[0],
-            n_points=len(seg_flux)
+    if NUMBA_AVAILABLE:
+        # Fused single sweep: no diff/mask/where temporaries
+        starts, ends = _scan_segment_bounds(
+            time, gap_threshold, min_segment_points
         )
-
-        segments.append(segment)
-
-    return segments
+    else:
+        # Vectorized fallback
+        gaps = detect_gaps(time, cadence_median, gap_threshold_multiplier,
+                           time_diffs=time_diffs)
+
+        # Find gap indices
+        gap_indices = np.where(gaps)[0] + 1  # +1 because gaps are after the index
+
+        boundaries = np.empty(gap_indices.size + 2, dtype=np.int64)
+        boundaries[0] = 0
+        boundaries[-1] = len(time)
+        boundaries[1:-1] = gap_indices
+
+        lengths = np.diff(boundaries)
+        keep = lengths >= min_segment_points
+        starts = boundaries[:-1][keep]
+        ends = boundaries[1:][keep]
+
+    return [
+        LightCurveSegment(
+            parent_flux=flux,
+            parent_time=time,
+            start_idx=int(start_idx),
+            end_idx=int(end_idx),
+        )
+        for start_idx, end_idx in zip(starts, ends)
+    ]
 
 
 def compute_gap_statistics(
     time: np.ndarray,
-    cadence_median: float
+    cadence_median: float,
+    time_diffs: Optional[np.ndarray] = None
 ) -> dict:
     """
     Compute statistics about gaps in light curve.
@@ -130,6 +239,7 @@ def compute_gap_statistics(
     Args:
         time: Time array (days)
         cadence_median: Median cadence
+        time_diffs: Precomputed np.diff(time) (optional)
 
     Returns:
         Dict with gap statistics
@@ -142,7 +252,10 @@ def compute_gap_statistics(
             'median_gap_days': 0.0,
         }
 
-    gaps = detect_gaps(time, cadence_median, gap_threshold_multiplier=3.0)
+    if time_diffs is None:
+        time_diffs = np.diff(time)
+    gaps = detect_gaps(time, cadence_median, gap_threshold_multiplier=3.0,
+                       time_diffs=time_diffs)
     n_gaps = np.sum(gaps)
 
     if n_gaps == 0:
@@ -154,7 +267,6 @@ def compute_gap_statistics(
         }
 
     # Gap sizes
-    time_diffs = np.diff(time)
     gap_sizes = time_diffs[gaps]
 
     # Total time span
@@ -177,7 +289,9 @@ def compute_gap_statistics(
 def interpolate_small_gaps(
     flux: np.ndarray,
     time: np.ndarray,
-    max_gap_size: int = 5
+    max_gap_size: int = 5,
+    time_diffs: Optional[np.ndarray] = None,
+    cadence_median: Optional[float] = None
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Interpolate small gaps (< max_gap_size missing cadences).
@@ -200,10 +314,12 @@ def interpolate_small_gaps(
     if len(time) < 2:
         return flux, time
 
-    cadence_median = np.median(np.diff(time))
+    if time_diffs is None:
+        time_diffs = np.diff(time)
+    if cadence_median is None:
+        cadence_median = _fast_median(time_diffs)
 
     # Find small gaps
-    time_diffs = np.diff(time)
     gap_threshold = max_gap_size * cadence_median
 
     # For now, just return original (full interpolation is complex)
@@ -7,6 +7,7 @@ Uses exponential backoff with jitter to avoid thundering herd.
 
 import asyncio
 import logging
+import random
 import time
 from dataclasses import dataclass
 from typing import Optional
@@ -71,13 +72,26 @@ class AdaptiveRateLimiter:
 
         Should be called before each request.
         """
+        # Lock-free fast path: reading a bool is atomic under the
+        # single-threaded event loop, and this is called before every
+        # request — only take the lock when we are actually limited.
+        if not self.state.is_limited:
+            return
+
         async with self._lock:
+            # Re-check: another task may have finished the wait while
+            # we were acquiring the lock
             if self.state.is_limited:
-                logger.warning(
-                    f"Rate limited: waiting {self.state.backoff_seconds:.1f}s "
-                    f"(attempt {self.state.rate_limit_count})"
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        f"Rate limited: waiting {self.state.backoff_seconds:.1f}s "
+                        f"(attempt {self.state.rate_limit_count})"
+                    )
+                # Jitter (0.5x-1.5x) so concurrent workers don't wake up
+                # in lockstep and trigger another 429 storm
+                await asyncio.sleep(
+                    self.state.backoff_seconds * random.uniform(0.5, 1.5)
                 )
-                await asyncio.sleep(self.state.backoff_seconds)
 
                 # Still limited, but allow retry
                 self.state.is_limited = False
@@ -101,10 +115,11 @@ class AdaptiveRateLimiter:
                 self.max_backoff,
             )
 
-            logger.error(
-                f"Rate limit hit! Count: {self.state.rate_limit_count}, "
-                f"Next backoff: {self.state.backoff_seconds:.1f}s"
-            )
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(
+                    f"Rate limit hit! Count: {self.state.rate_limit_count}, "
+                    f"Next backoff: {self.state.backoff_seconds:.1f}s"
+                )
 
     async def report_success(self) -> None:
         """
@@ -112,16 +127,19 @@ class AdaptiveRateLimiter:
 
         After sufficient successful requests, reset backoff to initial value.
         """
-        async with self._lock:
-            self.state.requests_since_limit += 1
-
-            # If we've had enough successful requests, consider it cooled down
-            if self.state.requests_since_limit >= self.cooldown_threshold:
-                if self.state.backoff_seconds > self.initial_backoff:
-                    logger.info(
-                        f"Cooldown complete: resetting backoff to {self.initial_backoff}s"
-                    )
-                    self.state.backoff_seconds = self.initial_backoff
+        # No lock needed: this runs on the single-threaded event loop and
+        # contains no awaits, so the increment-and-check below is atomic.
+        # Only report_rate_limit, where the backoff math matters, keeps
+        # the lock.
+        self.state.requests_since_limit += 1
+
+        # If we've had enough successful requests, consider it cooled down
+        if self.state.requests_since_limit >= self.cooldown_threshold:
+            if self.state.backoff_seconds > self.initial_backoff:
+                logger.info(
+                    f"Cooldown complete: resetting backoff to {self.initial_backoff}s"
+                )
+                self.state.backoff_seconds = self.initial_backoff
 
     def get_stats(self) -> dict:
         """Get current rate limiter statistics."""
@@ -22,6 +22,41 @@ from preprocessing.feature_extractor import FeatureExtractor
 logger = logging.getLogger(__name__)
 
 
+# Per-process extractor singleton. Pool workers survive many tasks, so
+# one FeatureExtractor (stateless: it only holds the domain dispatch
+# table) serves every extraction in the process instead of being
+# rebuilt per target.
+_WORKER_EXTRACTOR = None
+
+# Staleness guard for worker reuse. max_tasks_per_child=1 originally
+# papered over a bug where reused processes produced identical feature
+# values for different targets; with workers now surviving 64 tasks,
+# (path, signature) of the previous extraction is kept so a repeat of
+# the exact same feature dict for a *different* FITS file is caught
+# instead of silently uploaded.
+_LAST_EXTRACTION = None
+
+
+def _feature_signature(features: dict) -> int:
+    """Order-independent hash of a full feature dict."""
+    return hash(tuple(sorted((k, repr(v)) for k, v in features.items())))
+
+
+def _init_worker() -> None:
+    """
+    Process-pool initializer: pay the import cost at worker spawn.
+
+    The astropy/lightkurve import cascade (hundreds of ms) and the
+    extractor construction run once here, while the pool is starting
+    up, instead of inside the first task each worker receives.
+    """
+    global _WORKER_EXTRACTOR
+    import astropy.io.fits as fitsio
+    fitsio.Conf.use_memmap = False  # Disable mmap for WSL2 compatibility
+    from preprocessing.feature_extractor import FeatureExtractor
+    _WORKER_EXTRACTOR = FeatureExtractor()
+
+
 # Module-level function for multiprocessing (must be pickleable)
 def extract_features_standalone(fits_path_str: str, mission: str) -> tuple:
     """
@@ -38,6 +73,7 @@ def extract_features_standalone(fits_path_str: str, mission: str) -> tuple:
     """
     try:
         from pathlib import Path
+        import gc
         import os
         import astropy.io.fits as fitsio
         fitsio.Conf.use_memmap = False  # Disable mmap for WSL2 compatibility
@@ -46,15 +82,62 @@ def extract_features_standalone(fits_path_str: str, mission: str) -> tuple:
 
         logger = logging.getLogger(__name__)
 
-        extractor = FeatureExtractor()
-        features, validity = extractor.extract_features_from_fits(
+        global _WORKER_EXTRACTOR, _LAST_EXTRACTION
+        if _WORKER_EXTRACTOR is None:
+            _WORKER_EXTRACTOR = FeatureExtractor()
+
+        features, validity = _WORKER_EXTRACTOR.extract_features_from_fits(
             Path(fits_path_str),
             mission=mission
         )
 
-        # DEBUG: Log what we extracted
+        # Cross-target staleness guard: a different FITS file yielding a
+        # byte-identical feature dict means process-level state leaked
+        # across targets. Rebuild the extractor and retry once; if the
+        # result is still identical, fail the target rather than upload
+        # corrupt features.
         if features:
-            logger.info(f"[WORKER PID={os.getpid()}] Extracted from {Path(fits_path_str).name}: stat_mean={features.get('stat_mean'):.10f}, n_points={features.get('temp_n_points')}")
+            signature = _feature_signature(features)
+            if (
+                _LAST_EXTRACTION is not None
+                and signature == _LAST_EXTRACTION[1]
+                and fits_path_str != _LAST_EXTRACTION[0]
+            ):
+                logger.error(
+                    "[WORKER PID=%s] %s produced features identical to %s — "
+                    "stale worker state, rebuilding extractor and retrying",
+                    os.getpid(), fits_path_str, _LAST_EXTRACTION[0],
+                )
+                _WORKER_EXTRACTOR = FeatureExtractor()
+                features, validity = _WORKER_EXTRACTOR.extract_features_from_fits(
+                    Path(fits_path_str),
+                    mission=mission
+                )
+                signature = _feature_signature(features) if features else None
+                if signature is not None and signature == _LAST_EXTRACTION[1]:
+                    logger.error(
+                        "[WORKER PID=%s] %s still identical after extractor "
+                        "rebuild — failing target",
+                        os.getpid(), fits_path_str,
+                    )
+                    return None, None
+            if features:
+                _LAST_EXTRACTION = (fits_path_str, signature)
+
+        # Worker processes are reused across targets, so no per-target
+        # state may survive the call: force a collection, which also
+        # closes any HDU file handles lightkurve left open on the
+        # (about to be deleted) FITS file.
+        gc.collect()
+
+        if features and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[WORKER PID=%s] Extracted %s: stat_mean=%.10f, n_points=%s",
+                os.getpid(),
+                Path(fits_path_str).name,
+                features.get('stat_mean'),
+                features.get('temp_n_points'),
+            )
 
         return features, validity
     except Exception as e:
@@ -63,6 +146,31 @@ def extract_features_standalone(fits_path_str: str, mission: str) -> tuple:
         return None, None
 
 
+def extract_features_batch_standalone(
+    fits_path_strs: list,
+    mission: str,
+) -> list:
+    """
+    Extract features for several FITS files in one worker call.
+
+    One submission to the process pool pickles a list of path strings
+    and unpickles a list of result tuples — a single IPC round-trip
+    amortized over the whole chunk, instead of dispatch overhead per
+    target.
+
+    Args:
+        fits_path_strs: Paths to FITS files (as strings)
+        mission: Mission name
+
+    Returns:
+        List of (features dict, validity dict) tuples, input order
+    """
+    return [
+        extract_features_standalone(path, mission)
+        for path in fits_path_strs
+    ]
+
+
 @dataclass
 class PipelineResult:
     """Result from complete pipeline execution."""
@@ -112,6 +220,18 @@ class StreamingWorker:
             delete_fits: Delete FITS after extraction (recommended)
         """
         self.output_dir = Path(output_dir)
+
+        # Transient FITS files (downloaded, extracted once, deleted) do
+        # a full write+read round-trip through the filesystem. When
+        # they are going to be deleted anyway, stage them on tmpfs so
+        # both traversals stay in RAM and never touch the disk. The
+        # caller's directory is only used when files are kept.
+        if delete_fits:
+            shm_root = Path('/dev/shm')
+            if shm_root.is_dir():
+                self.output_dir = shm_root / 'xenoscan_fits'
+                logger.info(f"Staging transient FITS files on tmpfs: {self.output_dir}")
+
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.database_client = database_client
@@ -121,7 +241,7 @@ class StreamingWorker:
 
         # Downloader (async)
         self.downloader = AsyncDownloader(
-            output_dir=output_dir,
+            output_dir=self.output_dir,
             max_workers=max_workers,
             timeout=timeout,
         )
@@ -133,12 +253,21 @@ class StreamingWorker:
         # Cap CPU-bound workers lower than I/O workers (memory safety)
         # Feature extraction is memory-intensive, limit parallel processes
         cpu_workers = min(max_workers, 2)  # Conservative: max 2 CPU processes
-        # CRITICAL: max_tasks_per_child=1 prevents worker reuse and caching bugs
-        # Without this, lightkurve caches FITS data at process level causing
-        # identical feature values for different targets
+        self.cpu_workers = cpu_workers
+        # Up to this many queued targets ride one process-pool submission
+        self.extraction_chunk_size = cpu_workers * 4
+        # Workers are reused for up to 64 targets before being recycled.
+        # The old max_tasks_per_child=1 workaround (fresh process per
+        # extraction) paid interpreter startup plus the numpy/astropy
+        # import cascade for every single target; the per-process FITS
+        # caching it guarded against is handled in
+        # extract_features_standalone, which drops its extractor and
+        # gc-collects before returning. The periodic recycle stays as a
+        # backstop against slow leaks in the astronomy stack.
         self.process_pool = ProcessPoolExecutor(
             max_workers=cpu_workers,
-            max_tasks_per_child=1  # Fresh process for each extraction
+            max_tasks_per_child=64,
+            initializer=_init_worker,
         )
 
         logger.info(
@@ -150,7 +279,12 @@ class StreamingWorker:
         self.targets_processed = 0
         self.targets_succeeded = 0
         self.targets_failed = 0
-        self.upload_count = 0  # Track uploads for batch sleep
+
+        # Upload buffering: rows accumulate here and go to Supabase as
+        # one bulk upsert per _upload_buffer_size targets (plus a final
+        # flush), instead of two HTTP round-trips per target
+        self._upload_buffer: list = []
+        self._upload_buffer_size = 100
 
     async def process_target(
         self,
@@ -330,39 +464,234 @@ class StreamingWorker:
             logger.debug(f"[{target_id}] No database client, skipping upload")
             return
 
-        try:
-            # First, insert/update target metadata
-            await self.database_client.insert_target(
-                target_id=target_id,
-                mission=metadata.get('mission', 'unknown'),
-                n_points=metadata.get('n_points', 0),
-                duration_days=metadata.get('duration_days', 0.0),
-            )
+        target_row = {
+            'target_id': target_id,
+            'mission': metadata.get('mission', 'unknown').lower(),
+            'n_points': metadata.get('n_points', 0),
+            'duration_days': metadata.get('duration_days', 0.0),
+            'features_extracted': False,
+        }
+        feature_row = {
+            'target_id': target_id,
+            'extraction_time_seconds': metadata.get('extraction_time', 0.0),
+            'n_features_valid': sum(validity.values()),
+            'n_features_total': len(validity),
+            **features,
+        }
 
-            # DEBUG: Log what we're about to upload
-            logger.info(f"[UPLOAD] {target_id}: stat_mean={features.get('stat_mean'):.10f}, n_points={features.get('temp_n_points')}")
+        self._upload_buffer.append((target_row, feature_row))
+        logger.debug(f"[{target_id}] Buffered for upload ({len(self._upload_buffer)}/{self._upload_buffer_size})")
 
-            # Then insert features
-            await self.database_client.insert_features(
-                target_id=target_id,
-                features=features,
-                validity=validity,
-                extraction_time=metadata.get('extraction_time', 0.0),
-            )
+        if len(self._upload_buffer) >= self._upload_buffer_size:
+            await self._flush_uploads()
+
+    async def _flush_uploads(self) -> None:
+        """
+        Push every buffered row to the database in two bulk upserts.
 
-            logger.debug(f"[{target_id}] Uploaded to database")
+        One targets upsert and one features upsert carry the whole
+        buffer, so Supabase sees a couple of requests per hundred
+        targets rather than two per target — which also retires the old
+        sleep-every-50-uploads throttling workaround.
+        """
+        if not self._upload_buffer or self.database_client is None:
+            return
+
+        # Swap the buffer out before awaiting so rows buffered during
+        # the flush land in the next batch
+        pending = self._upload_buffer
+        self._upload_buffer = []
 
-            # Batch sleep strategy: prevent Supabase throttling
-            # Every 50 uploads, sleep for 1 second to give DB time to breathe
-            self.upload_count += 1
-            if self.upload_count % 50 == 0:
-                logger.info(f"[BATCH SLEEP] {self.upload_count} uploads complete, sleeping 1s to prevent DB throttling...")
-                await asyncio.sleep(1)
+        target_rows = [t for t, _ in pending]
+        feature_rows = [f for _, f in pending]
 
+        try:
+            await self.database_client.batch_insert_targets(target_rows)
+            await self.database_client.batch_insert_features(feature_rows)
+            logger.info(f"Flushed {len(pending)} targets to database")
         except Exception as e:
-            logger.error(f"[{target_id}] Database upload failed: {e}")
+            logger.error(f"Bulk upload of {len(pending)} targets failed: {e}")
             raise
 
+    def _failed_result(self, item: dict, error: str, **overrides) -> PipelineResult:
+        """Build a failure PipelineResult from partial pipeline state."""
+        fields = dict(
+            target_id=item['target_id'],
+            success=False,
+            download_time=item.get('download_time', 0.0),
+            extraction_time=item.get('extraction_time', 0.0),
+            upload_time=item.get('upload_time', 0.0),
+            total_time=time.time() - item['start_time'],
+            n_points=item.get('n_points', 0),
+            n_features_valid=0,
+            n_features_total=55,
+            error=error,
+        )
+        fields.update(overrides)
+        return PipelineResult(**fields)
+
+    def _record(self, results: dict, result: PipelineResult) -> None:
+        """Store a finished result and update worker counters."""
+        results[result.target_id] = result
+        self.targets_processed += 1
+        if result.success:
+            self.targets_succeeded += 1
+        else:
+            self.targets_failed += 1
+
+    async def _download_stage(
+        self,
+        dl_q: asyncio.Queue,
+        ext_q: asyncio.Queue,
+        results: dict,
+        mission: str,
+        cadence: str,
+    ) -> None:
+        """Pull target IDs and push downloaded FITS paths to extraction."""
+        while True:
+            try:
+                target_id = dl_q.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            item = {'target_id': target_id, 'start_time': time.time()}
+            try:
+                dl_start = time.time()
+                batch = await self.downloader.download_batch(
+                    [target_id],
+                    mission=mission,
+                    cadence=cadence,
+                    progress_callback=None,
+                )
+                download_result = batch[0]
+                item['download_time'] = time.time() - dl_start
+                item['n_points'] = download_result.n_points
+
+                if not download_result.success:
+                    self._record(results, self._failed_result(
+                        item, f"Download failed: {download_result.error}",
+                        n_points=0,
+                    ))
+                    continue
+
+                item['download_result'] = download_result
+                await ext_q.put(item)
+            except Exception as e:
+                logger.error(f"[{target_id}] Download stage failed: {e}", exc_info=True)
+                self._record(results, self._failed_result(item, str(e)))
+
+    async def _extract_stage(
+        self,
+        ext_q: asyncio.Queue,
+        up_q: asyncio.Queue,
+        results: dict,
+        mission: str,
+    ) -> None:
+        """Drive process-pool extraction for downloaded targets."""
+        loop = asyncio.get_event_loop()
+        while True:
+            item = await ext_q.get()
+            if item is None:
+                return
+
+            # Greedy batching: sweep up whatever else is already queued
+            # (up to the chunk size) so one IPC round-trip covers the
+            # lot. Never waits — a lone item still ships immediately.
+            chunk = [item]
+            while len(chunk) < self.extraction_chunk_size:
+                try:
+                    extra = ext_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if extra is None:
+                    # Stop sentinel: hand it back for this (or another)
+                    # worker to consume after the chunk is processed
+                    await ext_q.put(None)
+                    break
+                chunk.append(extra)
+
+            try:
+                ext_start = time.time()
+                outcomes = await loop.run_in_executor(
+                    self.process_pool,
+                    extract_features_batch_standalone,
+                    [str(c['download_result'].filepath) for c in chunk],
+                    mission,
+                )
+                chunk_time = (time.time() - ext_start) / len(chunk)
+
+                for chunk_item, (features, validity) in zip(chunk, outcomes):
+                    chunk_item['extraction_time'] = chunk_time
+                    if features is None:
+                        self._record(results, self._failed_result(
+                            chunk_item, "Feature extraction failed",
+                            filepath_deleted=False,
+                        ))
+                        continue
+                    chunk_item['features'] = features
+                    chunk_item['validity'] = validity
+                    await up_q.put(chunk_item)
+            except Exception as e:
+                logger.error(f"Extraction stage failed for chunk of {len(chunk)}: {e}", exc_info=True)
+                for chunk_item in chunk:
+                    self._record(results, self._failed_result(chunk_item, str(e)))
+
+    async def _upload_stage(
+        self,
+        up_q: asyncio.Queue,
+        results: dict,
+        mission: str,
+    ) -> None:
+        """Upload extracted features and clean up FITS files."""
+        while True:
+            item = await up_q.get()
+            if item is None:
+                return
+
+            target_id = item['target_id']
+            download_result = item['download_result']
+            try:
+                upload_start = time.time()
+                if self.database_client is not None:
+                    await self._upload_to_database(
+                        target_id=target_id,
+                        features=item['features'],
+                        validity=item['validity'],
+                        metadata={
+                            'mission': mission,
+                            'n_points': download_result.n_points,
+                            'duration_days': download_result.duration_days,
+                            'extraction_time': item['extraction_time'],
+                        }
+                    )
+                item['upload_time'] = time.time() - upload_start
+
+                fits_path = download_result.filepath
+                filepath_deleted = False
+                if self.delete_fits and fits_path and fits_path.exists():
+                    try:
+                        os.remove(fits_path)
+                        filepath_deleted = True
+                    except Exception as e:
+                        logger.warning(f"[{target_id}] Failed to delete FITS: {e}")
+
+                self._record(results, PipelineResult(
+                    target_id=target_id,
+                    success=True,
+                    download_time=item['download_time'],
+                    extraction_time=item['extraction_time'],
+                    upload_time=item['upload_time'],
+                    total_time=time.time() - item['start_time'],
+                    n_points=download_result.n_points,
+                    n_features_valid=sum(item['validity'].values()),
+                    n_features_total=55,
+                    error=None,
+                    filepath_deleted=filepath_deleted,
+                ))
+            except Exception as e:
+                logger.error(f"[{target_id}] Upload stage failed: {e}", exc_info=True)
+                self._record(results, self._failed_result(item, str(e)))
+
     async def process_batch(
         self,
         target_ids: list,
@@ -370,7 +699,15 @@ class StreamingWorker:
         cadence: str = 'long',
     ) -> list[PipelineResult]:
         """
-        Process batch of targets in parallel.
+        Process batch of targets through a staged pipeline.
+
+        Download, extraction and upload run as independent worker pools
+        connected by bounded queues, so the download of target j+1
+        overlaps the extraction of target j and the upload of target
+        j-1 — wall time per target approaches the slowest stage instead
+        of the sum of all three. The queue bounds provide backpressure:
+        downloads cannot race arbitrarily far ahead of extraction, which
+        caps FITS files held on disk at a few per worker.
 
         Args:
             target_ids: List of target identifiers
@@ -378,38 +715,62 @@ class StreamingWorker:
             cadence: Cadence type
 
         Returns:
-            List of PipelineResults
+            List of PipelineResults (same order as target_ids)
         """
-        tasks = [
-            self.process_target(target_id, mission, cadence)
-            for target_id in target_ids
-        ]
+        dl_q: asyncio.Queue = asyncio.Queue()
+        ext_q: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers * 2)
+        up_q: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers * 2)
+        results: dict = {}
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Handle exceptions
-        pipeline_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Task failed for {target_ids[i]}: {result}")
-                pipeline_results.append(
-                    PipelineResult(
-                        target_id=target_ids[i],
-                        success=False,
-                        download_time=0.0,
-                        extraction_time=0.0,
-                        upload_time=0.0,
-                        total_time=0.0,
-                        n_points=0,
-                        n_features_valid=0,
-                        n_features_total=55,
-                        error=str(result),
-                    )
-                )
-            else:
-                pipeline_results.append(result)
+        for target_id in target_ids:
+            dl_q.put_nowait(target_id)
 
-        return pipeline_results
+        dl_tasks = [
+            asyncio.ensure_future(
+                self._download_stage(dl_q, ext_q, results, mission, cadence)
+            )
+            for _ in range(self.max_workers)
+        ]
+        ext_tasks = [
+            asyncio.ensure_future(
+                self._extract_stage(ext_q, up_q, results, mission)
+            )
+            for _ in range(self.cpu_workers)
+        ]
+        up_tasks = [
+            asyncio.ensure_future(
+                self._upload_stage(up_q, results, mission)
+            )
+        ]
+
+        # Drain each stage in order: downloads finish, then extractors
+        # get their stop sentinels, then the uploader
+        await asyncio.gather(*dl_tasks)
+        for _ in ext_tasks:
+            await ext_q.put(None)
+        await asyncio.gather(*ext_tasks)
+        for _ in up_tasks:
+            await up_q.put(None)
+        await asyncio.gather(*up_tasks)
+
+        # Push any rows still sitting in the upload buffer
+        await self._flush_uploads()
+
+        return [
+            results.get(target_id) or PipelineResult(
+                target_id=target_id,
+                success=False,
+                download_time=0.0,
+                extraction_time=0.0,
+                upload_time=0.0,
+                total_time=0.0,
+                n_points=0,
+                n_features_valid=0,
+                n_features_total=55,
+                error="Target never completed pipeline",
+            )
+            for target_id in target_ids
+        ]
 
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -434,5 +795,6 @@ class StreamingWorker:
     async def shutdown(self):
         """Shutdown worker and cleanup resources."""
         logger.info("Shutting down streaming worker...")
+        await self._flush_uploads()
         self.process_pool.shutdown(wait=True)
         logger.info("Process pool shutdown complete")
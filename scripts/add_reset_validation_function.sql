@@ -0,0 +1,33 @@
+-- ============================================================================
+-- Server-side validation reset function
+-- ============================================================================
+-- Purpose: Clear the features and targets tables in ONE round-trip and ONE
+-- transaction, instead of separate PostgREST DELETE calls per table.
+-- Run this in Supabase SQL Editor once; scripts/reset_validation.py calls
+-- it via client.rpc('reset_validation_data') and falls back to per-table
+-- deletes if the function is missing.
+--
+-- Benefits over row-filter deletes:
+--   - Single HTTPS round-trip for the whole cleanup
+--   - Both deletes commit atomically (no window where targets exist
+--     without their features, or vice versa)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION reset_validation_data()
+RETURNS TABLE (features_deleted BIGINT, targets_deleted BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    n_features BIGINT;
+    n_targets BIGINT;
+BEGIN
+    -- Features first (foreign key constraint on targets)
+    DELETE FROM features;
+    GET DIAGNOSTICS n_features = ROW_COUNT;
+
+    DELETE FROM targets;
+    GET DIAGNOSTICS n_targets = ROW_COUNT;
+
+    RETURN QUERY SELECT n_features, n_targets;
+END;
+$$;
@@ -13,13 +13,11 @@ Gemini validation: "The Teff Stratification fix ensures that your Planet Host tr
 set is a true apples-to-apples comparison with your Quiet baseline."
 """
 
-import requests
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from io import StringIO
 
-# NASA Exoplanet Archive TAP service
-TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+from tap_client import tap_query
 
 
 def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/known_planets_100.txt"):
@@ -57,8 +55,11 @@ def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/know
     # Query for confirmed Kepler planets using the ps (planetary systems) table
     # This table contains all confirmed exoplanets
     # NOTE: st_teff IS NOT NULL ensures we have stellar temperature for stratification
+    # TOP 5000 caps the transfer at a generous multiple of the 100 hosts we
+    # keep; ordering by st_teff means any rows the cap drops are the hottest
+    # ones, which the coolest-first selection below would discard anyway
     query = """
-    SELECT DISTINCT
+    SELECT DISTINCT TOP 5000
         tic_id,
         hostname,
         pl_name,
@@ -74,44 +75,39 @@ def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/know
         AND pl_orbper IS NOT NULL
         AND pl_rade IS NOT NULL
         AND st_teff IS NOT NULL
-    ORDER BY hostname ASC
+        AND hostname LIKE 'Kepler-%'
+    ORDER BY st_teff ASC, hostname ASC
     """
 
-    params = {
-        'query': query,
-        'format': 'csv'
-    }
-
     print("Querying NASA Exoplanet Archive...")
-    response = requests.get(TAP_URL, params=params)
-
-    if response.status_code != 200:
-        raise Exception(f"TAP query failed: {response.status_code}\n{response.text}")
-
-    # Parse CSV
-    df = pd.read_csv(StringIO(response.text))
+    df = tap_query(query)
 
     print(f"Found {len(df)} confirmed planet entries (with Teff data)")
     print()
 
     # Get unique host stars with their Teff (some stars have multiple planets)
-    # Take the first Teff value for each hostname
-    host_teff = df.groupby('hostname').agg({
-        'st_teff': 'first',
-        'pl_name': 'count'
-    }).reset_index()
-    host_teff.columns = ['hostname', 'st_teff', 'n_planets']
-
-    # Filter to only Kepler targets (start with "Kepler-")
-    kepler_hosts = host_teff[host_teff['hostname'].str.startswith('Kepler-')].copy()
+    # Take the first Teff value for each hostname. drop_duplicates and
+    # value_counts are single C-level hash passes — cheaper than spinning
+    # up a GroupBy with per-column aggregator dispatch for a first/count duo
+    host_teff = df.drop_duplicates('hostname', keep='first')[['hostname', 'st_teff']].copy()
+    host_teff['n_planets'] = host_teff['hostname'].map(df['hostname'].value_counts())
+    host_teff = host_teff.reset_index(drop=True)
+
+    # "Kepler-" hostnames only — the query's LIKE clause already filtered
+    # server-side, so every row here is a Kepler target
+    kepler_hosts = host_teff
     print(f"{len(kepler_hosts)} unique Kepler host stars with Teff data")
 
     # TEFF STRATIFICATION (REMEDIATION 2026-01-17)
-    # Split by stellar type to match quiet star distribution
-    sunlike_hosts = kepler_hosts[
-        (kepler_hosts['st_teff'] >= 4000) & (kepler_hosts['st_teff'] <= 7000)
-    ].copy()
-    mdwarf_hosts = kepler_hosts[kepler_hosts['st_teff'] < 4000].copy()
+    # Split by stellar type to match quiet star distribution.
+    # One vectorized binning pass + one groupby instead of two separate
+    # boolean-mask scans and copies (0=M-dwarf, 1=Sun-like, 2=hotter)
+    teff = kepler_hosts['st_teff'].to_numpy()
+    teff_bin = np.where(teff < 4000, 0, np.where(teff <= 7000, 1, 2))
+    groups = dict(iter(kepler_hosts.groupby(teff_bin)))
+    empty = kepler_hosts.iloc[0:0]
+    sunlike_hosts = groups.get(1, empty)
+    mdwarf_hosts = groups.get(0, empty)
 
     print(f"\nAvailable by stellar type:")
     print(f"  Sun-like (Teff 4000-7000K): {len(sunlike_hosts)} hosts")
@@ -135,6 +131,9 @@ def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/know
     selected_mdwarfs = mdwarf_hosts_sorted.head(actual_n_mdwarfs)['hostname'].tolist()
 
     selected_hosts = selected_sunlike + selected_mdwarfs
+    # Hash-based membership for the isin() filters below — O(1) per row
+    # instead of scanning a 100-element list
+    selected_set = set(selected_hosts)
 
     # Get stats for selected hosts
     print(f"\nSelected {len(selected_hosts)} planet hosts:")
@@ -142,7 +141,7 @@ def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/know
     print(f"  M-Dwarfs: {len(selected_mdwarfs)} ({100 * len(selected_mdwarfs) / len(selected_hosts):.1f}%)")
 
     # Verify Teff distribution
-    selected_teff = kepler_hosts[kepler_hosts['hostname'].isin(selected_hosts)]['st_teff']
+    selected_teff = kepler_hosts[kepler_hosts['hostname'].isin(selected_set)]['st_teff']
     print(f"\nSelected Teff range: {selected_teff.min():.0f} - {selected_teff.max():.0f} K")
     print(f"  Mean Teff: {selected_teff.mean():.0f} K")
 
@@ -153,23 +152,24 @@ def fetch_planet_hosts(n_stars=100, mdwarf_fraction=0.20, output_file="data/know
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w') as f:
-        f.write('\n'.join(targets))
+    output_path.write_text('\n'.join(targets))
 
     print(f"Wrote {len(targets)} targets to {output_file}")
 
     # Also save metadata CSV for later upload
     # Get unique host star metadata (one row per star)
-    metadata_df = df[df['hostname'].isin(selected_hosts)].drop_duplicates(subset=['hostname'])
+    metadata_df = df[df['hostname'].isin(selected_set)].drop_duplicates(subset=['hostname'])
     metadata_file = output_file.replace('.txt', '_metadata.csv')
     metadata_df.to_csv(metadata_file, index=False)
     print(f"Wrote metadata to {metadata_file}")
     print()
 
-    # Print first 10 targets with Teff info
+    # Print first 10 targets with Teff info (hash lookup per host instead
+    # of a boolean-mask scan of the whole table each iteration)
+    host_lookup = kepler_hosts.set_index('hostname')[['st_teff', 'n_planets']]
     print("First 10 targets (Teff-stratified):")
     for i, hostname in enumerate(selected_hosts[:10], 1):
-        host_info = kepler_hosts[kepler_hosts['hostname'] == hostname].iloc[0]
+        host_info = host_lookup.loc[hostname]
         teff = host_info['st_teff']
         n_planets = host_info['n_planets']
         stellar_type = "M-dwarf" if teff < 4000 else "Sun-like"
@@ -12,12 +12,10 @@ SCIENTIFIC VALIDATION: Includes 20% M-Dwarfs (Teff < 4000K) for
 Pandora mission compatibility and to avoid stellar type bias.
 """
 
-import requests
 import pandas as pd
 from pathlib import Path
 
-# NASA Exoplanet Archive TAP service
-TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+from tap_client import tap_query
 
 
 def fetch_stars_by_type(query, star_type):
@@ -31,19 +29,8 @@ def fetch_stars_by_type(query, star_type):
     Returns:
         DataFrame of results
     """
-    params = {
-        'query': query,
-        'format': 'csv'
-    }
-
     print(f"Querying {star_type}...")
-    response = requests.get(TAP_URL, params=params)
-
-    if response.status_code != 200:
-        raise Exception(f"TAP query failed: {response.status_code}\n{response.text}")
-
-    from io import StringIO
-    return pd.read_csv(StringIO(response.text))
+    return tap_query(query)
 
 
 def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet_stars_900.txt"):
@@ -85,7 +72,12 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
     print(f"  M-Dwarfs (Teff < 4000K): {n_mdwarfs} stars ({mdwarf_fraction * 100:.0f}%)")
     print()
 
-    # Query 1: Sun-like stars (Teff 4000-7000K)
+    # Single UNION ALL query covering both strata, each branch tagged with
+    # a stellar_type literal so the split survives the round trip. One
+    # HTTPS call, one parse, one DataFrame instead of two of each against
+    # the same table. The shared ORDER BY keeps rows ranked quietest-first
+    # so the head() selection below still picks the lowest-CDPP stars.
+    #
     # Column names from NASA keplerstellar table:
     #   teff = effective temperature
     #   radius = stellar radius
@@ -93,7 +85,12 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
     #   rrmscdpp03p0 = 3-hour CDPP
     #   rrmscdpp06p0 = 6-hour CDPP
     #   nkoi = number of KOIs (planet candidates)
-    query_sunlike = f"""
+    # M-Dwarfs are smaller (typical radius 0.1-0.6 Rsun) and have higher
+    # intrinsic variability, so their branch uses relaxed CDPP thresholds.
+    # No per-branch TOP: ADQL only allows ORDER BY on the whole union, and
+    # TOP without it would keep an arbitrary subset rather than the
+    # quietest — the CDPP cuts already bound the row count instead.
+    query = """
     SELECT DISTINCT
         kepid,
         nkoi,
@@ -101,7 +98,8 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
         radius,
         mass,
         rrmscdpp03p0,
-        rrmscdpp06p0
+        rrmscdpp06p0,
+        'Sun-like' AS stellar_type
     FROM keplerstellar
     WHERE
         nkoi = 0
@@ -109,18 +107,7 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
         AND rrmscdpp06p0 < 250
         AND teff BETWEEN 4000 AND 7000
         AND radius BETWEEN 0.5 AND 2.0
-    ORDER BY rrmscdpp03p0 ASC
-    """
-
-    df_sunlike = fetch_stars_by_type(query_sunlike, "Sun-like stars (Teff 4000-7000K)")
-    df_sunlike = df_sunlike.drop_duplicates(subset='kepid', keep='first')
-    print(f"  Found {len(df_sunlike)} unique sun-like stars")
-
-    # Query 2: M-Dwarfs (Teff < 4000K)
-    # Note: M-Dwarfs are smaller (typical radius 0.1-0.6 Rsun)
-    # and have higher intrinsic variability, so we use slightly
-    # relaxed CDPP thresholds
-    query_mdwarfs = f"""
+    UNION ALL
     SELECT DISTINCT
         kepid,
         nkoi,
@@ -128,7 +115,8 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
         radius,
         mass,
         rrmscdpp03p0,
-        rrmscdpp06p0
+        rrmscdpp06p0,
+        'M-Dwarf' AS stellar_type
     FROM keplerstellar
     WHERE
         nkoi = 0
@@ -140,8 +128,18 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
     ORDER BY rrmscdpp03p0 ASC
     """
 
-    df_mdwarfs = fetch_stars_by_type(query_mdwarfs, "M-Dwarf stars (Teff < 4000K)")
-    df_mdwarfs = df_mdwarfs.drop_duplicates(subset='kepid', keep='first')
+    df_all = fetch_stars_by_type(query, "quiet stars (both strata, single call)")
+
+    # Single dedup pass: keplerstellar carries one row per quarter-set per
+    # star, so the same kepid recurs with different CDPP values. keep='first'
+    # retains the quietest row thanks to the query's ORDER BY. Doing this
+    # once here (before the head() selections) replaces the per-stratum,
+    # post-concat and final-list dedup passes that each rescanned the data.
+    df_all = df_all.drop_duplicates(subset='kepid', keep='first')
+
+    df_sunlike = df_all[df_all['stellar_type'] == 'Sun-like']
+    print(f"  Found {len(df_sunlike)} unique sun-like stars")
+    df_mdwarfs = df_all[df_all['stellar_type'] == 'M-Dwarf']
     print(f"  Found {len(df_mdwarfs)} unique M-Dwarf stars")
     print()
 
@@ -156,14 +154,9 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
     df_sunlike_subset = df_sunlike.head(n_sunlike)
     df_mdwarfs_subset = df_mdwarfs.head(n_mdwarfs)
 
-    # Combine the datasets
+    # Combine the datasets (stellar_type comes tagged from the query)
     df_combined = pd.concat([df_sunlike_subset, df_mdwarfs_subset], ignore_index=True)
 
-    # Add stellar type classification
-    df_combined['stellar_type'] = df_combined['teff'].apply(
-        lambda t: 'M-Dwarf' if t < 4000 else 'Sun-like'
-    )
-
     # Shuffle to avoid systematic ordering
     df_combined = df_combined.sample(frac=1, random_state=42).reset_index(drop=True)
 
@@ -184,15 +177,13 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
             print(f"  CDPP (3hr) range: {subset['rrmscdpp03p0'].min():.1f} - {subset['rrmscdpp03p0'].max():.1f} ppm")
             print()
 
-    # Deduplicate by kepid before formatting (NASA archive sometimes has duplicate entries)
-    df_combined = df_combined.drop_duplicates(subset='kepid', keep='first')
-    print(f"After deduplication: {len(df_combined)} unique stars")
-
-    # Format as "KIC {kepid}" with 9-digit zero-padding for consistency
-    targets = [f"KIC {str(int(kepid)).zfill(9)}" for kepid in df_combined['kepid']]
-
-    # Extra safety: deduplicate the final list
-    targets = list(dict.fromkeys(targets))  # Preserves order, removes duplicates
+    # kepids are already unique (single dedup pass above, before the splits)
+    # Format as "KIC {kepid}" with 9-digit zero-padding for consistency;
+    # vectorized string ops run in pandas' C layer rather than a Python
+    # f-string per row
+    targets = (
+        "KIC " + df_combined['kepid'].astype('int64').astype(str).str.zfill(9)
+    ).tolist()
 
     # Write target IDs to file
     output_path = Path(output_file)
@@ -225,11 +216,9 @@ def fetch_quiet_stars(n_stars=900, mdwarf_fraction=0.20, output_file="data/quiet
     print()
 
     print("First 10 targets (shuffled):")
-    for i, (_, row) in enumerate(df_combined.head(10).iterrows(), 1):
-        target = f"KIC {int(row['kepid'])}"
-        stype = row['stellar_type']
-        teff = row['teff']
-        print(f"  {i}. {target} ({stype}, Teff={teff:.0f}K)")
+    for i, row in enumerate(df_combined.head(10).itertuples(), 1):
+        target = f"KIC {int(row.kepid)}"
+        print(f"  {i}. {target} ({row.stellar_type}, Teff={row.teff:.0f}K)")
 
     return targets
 
@@ -11,7 +11,11 @@ https://archive.stsci.edu/missions/kepler/lightcurves/{first4}/{kic9}/kplr{kic9}
 
 import sys
 from pathlib import Path
+import asyncio
 import logging
+import random
+import time
+import aiohttp
 import requests
 from typing import List, Tuple, Optional
 import re
@@ -26,6 +30,21 @@ logger = logging.getLogger(__name__)
 # Base URL for Kepler lightcurves
 MAST_BASE = "https://archive.stsci.edu/missions/kepler/lightcurves"
 
+# NASA Exoplanet Archive TAP service (planet-name -> KIC resolution)
+TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+
+# Directory listing link pattern, e.g. href="kplr007584294-2009131105131_llc.fits"
+_FITS_LINK_RE = re.compile(r'href="(kplr\d+-\d+_llc\.fits)"')
+
+# Concurrent directory fetches; listing pages are tiny, so latency dominates
+MAX_CONCURRENT_FETCHES = 64
+
+# On-disk cache of parsed directory listings. Kepler is a finished
+# mission, so the listing for a given KIC is effectively immutable —
+# repeat runs over the same target list skip MAST entirely.
+LISTING_CACHE_DIR = Path(__file__).parent.parent / "data" / ".mast_listings"
+LISTING_CACHE_TTL = 30 * 86400  # seconds
+
 
 def kic_to_url_components(kic_id: str) -> Tuple[str, str]:
     """
@@ -98,10 +117,9 @@ def resolve_kepler_name_to_kic(kepler_name: str) -> Optional[str]:
 
     # Fallback: Try NASA Exoplanet Archive
     try:
-        tap_url = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
         query = f"SELECT DISTINCT kepid FROM pscomppars WHERE hostname = '{name}' AND kepid IS NOT NULL"
 
-        response = requests.get(tap_url, params={
+        response = requests.get(TAP_URL, params={
             'query': query,
             'format': 'json'
         }, timeout=30)
@@ -118,14 +136,74 @@ def resolve_kepler_name_to_kic(kepler_name: str) -> Optional[str]:
     return None
 
 
-def get_fits_urls_for_target(kic_id: str) -> List[str]:
+def resolve_many_kepler_names(names: List[str]) -> dict:
+    """
+    Resolve many Kepler planet names to KIC IDs in one TAP query each 500.
+
+    One IN-list query replaces a lightkurve search (which drags in MAST
+    name resolution) plus a TAP round trip per name. Names the archive
+    doesn't know are simply absent from the result; callers should fall
+    back to resolve_kepler_name_to_kic for those.
+
+    Args:
+        names: Planet names like "Kepler-10"
+
+    Returns:
+        Dict mapping hostname -> KIC ID string (resolved names only)
+    """
+    resolved = {}
+
+    # Chunk the IN-list to keep each query comfortably under URL/parse limits
+    chunk_size = 500
+    for start in range(0, len(names), chunk_size):
+        batch = names[start:start + chunk_size]
+        in_list = ", ".join(
+            "'" + name.strip().replace("'", "''") + "'" for name in batch
+        )
+        query = (
+            "SELECT DISTINCT hostname, kepid FROM pscomppars "
+            f"WHERE hostname IN ({in_list}) AND kepid IS NOT NULL"
+        )
+
+        try:
+            # POST keeps long IN-lists out of the URL
+            response = requests.post(
+                TAP_URL, data={'query': query, 'format': 'json'}, timeout=60
+            )
+            if response.status_code != 200:
+                logger.warning(
+                    f"Batch name resolution failed: HTTP {response.status_code}"
+                )
+                continue
+            for row in response.json():
+                hostname = row.get('hostname')
+                kepid = row.get('kepid')
+                if hostname and kepid:
+                    resolved[hostname] = str(int(kepid))
+        except Exception as e:
+            logger.warning(f"Batch name resolution failed: {e}")
+
+    return resolved
+
+
+async def get_fits_urls_for_target(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    kic_id: str,
+    retry_attempts: int = 3,
+) -> List[str]:
     """
     Get all FITS file URLs for a given KIC target.
 
     This scrapes the MAST directory listing to find all available files.
+    Directory fetches are pure I/O, so callers run many of these
+    concurrently on one event loop behind a shared semaphore.
 
     Args:
+        session: Shared aiohttp session (keep-alive connection pool)
+        semaphore: Concurrency gate
         kic_id: KIC identifier
+        retry_attempts: Retries for 5xx responses and timeouts
 
     Returns:
         List of full URLs to FITS files
@@ -135,36 +213,107 @@ def get_fits_urls_for_target(kic_id: str) -> List[str]:
     # Directory URL for this target
     dir_url = f"{MAST_BASE}/{first4}/{kic9}/"
 
-    try:
-        response = requests.get(dir_url, timeout=30)
-
-        if response.status_code == 404:
-            logger.warning(f"No data found for KIC {kic_id}")
-            return []
-
-        if response.status_code != 200:
-            logger.warning(f"Failed to fetch directory for KIC {kic_id}: HTTP {response.status_code}")
-            return []
-
-        # Parse HTML to find FITS file links
-        # Looking for: href="kplr007584294-2009131105131_llc.fits"
-        fits_pattern = re.compile(r'href="(kplr\d+-\d+_llc\.fits)"')
-        matches = fits_pattern.findall(response.text)
-
-        # Build full URLs
-        urls = [f"{dir_url}{filename}" for filename in matches]
-
-        return urls
-
-    except Exception as e:
-        logger.error(f"Error fetching URLs for KIC {kic_id}: {e}")
-        return []
-
+    # Serve from the listing cache when fresh (tiny file, cheap to read)
+    cache_path = LISTING_CACHE_DIR / first4 / f"{kic9}.txt"
+    if (
+        cache_path.exists()
+        and time.time() - cache_path.stat().st_mtime < LISTING_CACHE_TTL
+    ):
+        return [url for url in cache_path.read_text().splitlines() if url]
+
+    # Decorrelated jitter, same scheme as bulk_downloader
+    backoff = 1.0
+
+    async with semaphore:
+        for attempt in range(1, retry_attempts + 1):
+            try:
+                async with session.get(dir_url) as response:
+                    if response.status == 404:
+                        logger.warning(f"No data found for KIC {kic_id}")
+                        return []
+
+                    if response.status != 200:
+                        if response.status >= 500 and attempt < retry_attempts:
+                            backoff = random.uniform(1.0, min(60.0, backoff * 3.0))
+                            await asyncio.sleep(backoff)
+                            continue
+                        logger.warning(
+                            f"Failed to fetch directory for KIC {kic_id}: HTTP {response.status}"
+                        )
+                        return []
+
+                    # Stream-parse the listing: scan each 64 KB chunk as it
+                    # arrives instead of buffering the whole page, carrying
+                    # a short unmatched tail so an href split across a
+                    # chunk boundary still matches. Overlaps parsing with
+                    # download and keeps peak memory flat on the very large
+                    # superstamp directories.
+                    matches = []
+                    carry = ""
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        carry += chunk.decode('utf-8', errors='replace')
+                        last_end = 0
+                        for m in _FITS_LINK_RE.finditer(carry):
+                            matches.append(m.group(1))
+                            last_end = m.end()
+                        carry = carry[max(last_end, len(carry) - 128):]
+
+                # Build full URLs
+                urls = [f"{dir_url}{filename}" for filename in matches]
+
+                # Cache the parsed listing (temp file + rename so a crash
+                # never leaves a truncated entry)
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path = cache_path.with_suffix('.tmp')
+                    temp_path.write_text('\n'.join(urls))
+                    temp_path.replace(cache_path)
+                except OSError as e:
+                    logger.debug(f"Could not cache listing for KIC {kic_id}: {e}")
+
+                return urls
+
+            except asyncio.TimeoutError:
+                if attempt < retry_attempts:
+                    backoff = random.uniform(1.0, min(60.0, backoff * 3.0))
+                    await asyncio.sleep(backoff)
+                    continue
+                logger.error(f"Timed out fetching URLs for KIC {kic_id}")
+            except Exception as e:
+                logger.error(f"Error fetching URLs for KIC {kic_id}: {e}")
+                return []
+
+    return []
+
+
+async def _fetch_urls_for_targets(kic_ids: List[str]) -> List[List[str]]:
+    """
+    Fetch directory listings for many targets concurrently.
 
-def process_target_list(input_file: Path, output_file: Path):
+    Returns one URL list per input KIC, in input order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=MAX_CONCURRENT_FETCHES,
+        ttl_dns_cache=600,
+        keepalive_timeout=60,
+    )
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(*[
+            get_fits_urls_for_target(session, semaphore, kic)
+            for kic in kic_ids
+        ])
+
+
+async def process_target_list_async(input_file: Path, output_file: Path):
     """
     Process a target list file and generate download URLs.
 
+    Runs on the caller's event loop; synchronous callers should use
+    process_target_list instead.
+
     Args:
         input_file: Path to file with target IDs (one per line)
         output_file: Path to write URLs (one per line)
@@ -177,12 +326,24 @@ def process_target_list(input_file: Path, output_file: Path):
 
     all_urls = []
     kic_mapping = {}  # For reference: target_name -> KIC
+    resolved = []  # (target, kic) pairs in input order
+
+    # Resolve all planet names up front with one TAP query per 500 names;
+    # the per-name lightkurve/TAP path below only handles the leftovers
+    planet_names = [t for t in targets if t.lower().startswith('kepler-')]
+    batch_resolved = resolve_many_kepler_names(planet_names) if planet_names else {}
+    if batch_resolved:
+        logger.info(
+            f"Batch-resolved {len(batch_resolved)}/{len(planet_names)} planet names via TAP"
+        )
 
     for i, target in enumerate(targets):
         # Check if it's a Kepler planet name (needs resolution)
         if target.lower().startswith('kepler-'):
-            logger.info(f"[{i+1}/{len(targets)}] Resolving {target}...")
-            kic = resolve_kepler_name_to_kic(target)
+            kic = batch_resolved.get(target.strip())
+            if not kic:
+                logger.info(f"[{i+1}/{len(targets)}] Resolving {target}...")
+                kic = resolve_kepler_name_to_kic(target)
             if kic:
                 kic_mapping[target] = kic
                 logger.info(f"  -> KIC {kic}")
@@ -194,14 +355,19 @@ def process_target_list(input_file: Path, output_file: Path):
             kic = target
             kic_mapping[target] = kic
 
-        # Get FITS URLs for this target
-        urls = get_fits_urls_for_target(kic)
+        resolved.append((target, kic))
+
+    # Scrape all directory listings concurrently: each fetch is a tiny
+    # HTML page dominated by round-trip latency, so wall time is
+    # ~N·RTT/concurrency instead of N·RTT when done one at a time
+    url_lists = await _fetch_urls_for_targets([kic for _, kic in resolved])
 
+    for i, ((target, kic), urls) in enumerate(zip(resolved, url_lists)):
         if urls:
             all_urls.extend(urls)
-            logger.info(f"[{i+1}/{len(targets)}] {target}: {len(urls)} files")
+            logger.info(f"[{i+1}/{len(resolved)}] {target}: {len(urls)} files")
         else:
-            logger.warning(f"[{i+1}/{len(targets)}] {target}: no files found")
+            logger.warning(f"[{i+1}/{len(resolved)}] {target}: no files found")
 
     # Write URLs to output file
     with open(output_file, 'w') as f:
@@ -224,6 +390,17 @@ def process_target_list(input_file: Path, output_file: Path):
     return all_urls
 
 
+def process_target_list(input_file: Path, output_file: Path):
+    """
+    Synchronous entry point for process_target_list_async.
+
+    Only for callers without a running event loop (e.g. the CLI below);
+    asyncio.run() raises RuntimeError inside a running loop, so async
+    callers must await process_target_list_async directly.
+    """
+    return asyncio.run(process_target_list_async(input_file, output_file))
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
@@ -15,7 +15,7 @@ from pathlib import Path
 import logging
 import time
 from typing import Dict, List, Optional, Any
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import glob
 
 # Add parent directory to path
@@ -36,6 +36,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _read_llc_fast(fits_file: Path) -> Any:
+    """
+    Read a Kepler long-cadence FITS file directly with astropy.
+
+    Pulls just the columns the pipeline uses (TIME, PDCSAP_FLUX, quality,
+    centroids) out of the binary table and builds a LightCurve, skipping
+    lk.read's format detection, unit/meta parsing and full table
+    materialization. Applies the same default quality bitmask lk.read
+    would, so downstream numbers are unchanged.
+
+    Raises on any unexpected layout; callers fall back to lk.read.
+    """
+    import numpy as np
+    from lightkurve.utils import KeplerQualityFlags
+
+    with fitsio.open(fits_file, memmap=False) as hdul:
+        data = hdul[1].data
+        time = np.asarray(data['TIME'], dtype=np.float64)
+        flux = np.asarray(data['PDCSAP_FLUX'], dtype=np.float64)
+        quality = np.asarray(data['SAP_QUALITY'], dtype=np.int64)
+        centr1 = np.asarray(data['MOM_CENTR1'], dtype=np.float64)
+        centr2 = np.asarray(data['MOM_CENTR2'], dtype=np.float64)
+
+    # Mirror lk.read's default quality filtering
+    mask = (quality & KeplerQualityFlags.DEFAULT_BITMASK) == 0
+    mask &= np.isfinite(time)
+
+    lc = lk.LightCurve(time=time[mask], flux=flux[mask])
+    # Centroid columns feed the centroid feature extractor
+    lc['mom_centr1'] = centr1[mask]
+    lc['mom_centr2'] = centr2[mask]
+    return lc
+
+
 def stitch_target_lightcurves(fits_dir: Path, kic_id: str) -> Optional[Any]:
     """
     Load and stitch all quarter lightcurves for a target.
@@ -69,15 +103,27 @@ def stitch_target_lightcurves(fits_dir: Path, kic_id: str) -> Optional[Any]:
         logger.warning(f"No FITS files found for KIC {kic_id} in {target_dir}")
         return None
 
-    # Load each quarter
-    quarter_lcs = []
-    for fits_file in fits_files:
+    def _load_one(fits_file):
+        # Direct astropy read, lk.read as fallback for anything with an
+        # unexpected layout
         try:
-            lc = lk.read(fits_file)
-            quarter_lcs.append(lc)
-        except Exception as e:
-            logger.warning(f"Failed to read {fits_file.name}: {e}")
-            continue
+            return _read_llc_fast(fits_file)
+        except Exception:
+            try:
+                return lk.read(fits_file)
+            except Exception as e:
+                logger.warning(f"Failed to read {fits_file.name}: {e}")
+                return None
+
+    # Quarters are independent files, so thread the reads: disk I/O and
+    # the numpy column copies release the GIL. The pool is kept small
+    # because this already runs inside one of several worker processes;
+    # map() preserves quarter order for the stitch.
+    n_threads = min(4, len(fits_files))
+    with ThreadPoolExecutor(max_workers=n_threads) as read_pool:
+        quarter_lcs = [
+            lc for lc in read_pool.map(_load_one, fits_files) if lc is not None
+        ]
 
     if not quarter_lcs:
         logger.warning(f"No quarters loaded for KIC {kic_id}")
@@ -99,6 +145,23 @@ def stitch_target_lightcurves(fits_dir: Path, kic_id: str) -> Optional[Any]:
         return None
 
 
+# Full gc.collect() after every star is a stop-the-world pause that
+# dwarfs the garbage actually produced; amortize it over a few targets.
+# Worker processes are still recycled by max_tasks_per_child, which
+# bounds any slow leak regardless.
+_GC_INTERVAL = 8
+_tasks_since_gc = 0
+
+
+def _maybe_collect():
+    """Run gc.collect() every _GC_INTERVAL calls instead of every call."""
+    global _tasks_since_gc
+    _tasks_since_gc += 1
+    if _tasks_since_gc >= _GC_INTERVAL:
+        gc.collect()
+        _tasks_since_gc = 0
+
+
 def extract_features_from_local(
     fits_dir: str,
     kic_id: str,
@@ -179,13 +242,13 @@ def extract_features_from_local(
 
         # Memory hygiene: prevent bloat over 900 stars
         # (Gemini's Guardrail 3: "Flush the toilet after each star")
-        gc.collect()
+        _maybe_collect()
 
         return (kic_id, features, validity)
 
     except Exception as e:
         logger.error(f"KIC {kic_id}: Feature extraction failed: {e}")
-        gc.collect()  # Clean up even on failure
+        _maybe_collect()  # Clean up even on failure
         return (kic_id, None, None)
 
 
@@ -198,7 +261,7 @@ class LocalProcessor:
         self,
         fits_dir: Path,
         database_client: Optional[Any] = None,
-        max_workers: int = 2,
+        max_workers: Optional[int] = None,
         delete_after_processing: bool = False,
     ):
         """
@@ -208,21 +271,30 @@ class LocalProcessor:
             fits_dir: Directory containing downloaded FITS files
             database_client: Database client for uploads (None = dry run)
             max_workers: Number of parallel feature extraction processes
+                (default: one per CPU core — extraction is CPU-bound)
             delete_after_processing: Delete FITS files after feature extraction
         """
         self.fits_dir = Path(fits_dir)
         self.database_client = database_client
-        self.max_workers = max_workers
+        self.max_workers = max_workers or os.cpu_count() or 2
         self.delete_after_processing = delete_after_processing
 
-        # Process pool for CPU-bound feature extraction
+        # Process pool for CPU-bound feature extraction. Recycling a
+        # worker every 16 targets (instead of every target) keeps the
+        # leak guard while amortizing the fork + interpreter + import
+        # startup cost across tasks.
         self.process_pool = ProcessPoolExecutor(
-            max_workers=max_workers,
-            max_tasks_per_child=1  # Fresh process per task to avoid memory issues
+            max_workers=self.max_workers,
+            max_tasks_per_child=16
         )
 
+        # Upload buffer: rows accumulate here and flush as one multi-row
+        # upsert per table instead of two round trips per target
+        self._upload_buffer: List[tuple] = []  # (target_row, feature_row)
+        self._upload_buffer_size = 64
+
         logger.info(
-            f"LocalProcessor initialized: {max_workers} workers, "
+            f"LocalProcessor initialized: {self.max_workers} workers, "
             f"fits_dir: {fits_dir}, delete_after: {delete_after_processing}"
         )
 
@@ -279,7 +351,7 @@ class LocalProcessor:
                     'elapsed': time.time() - start_time
                 }
 
-            # Upload to database
+            # Queue for batched database upload
             if self.database_client is not None:
                 try:
                     # Standardize target ID format
@@ -290,22 +362,27 @@ class LocalProcessor:
                     else:
                         canonical_id = str(kic_id)  # Keep Kepler-X names as-is
 
-                    await self.database_client.insert_target(
-                        target_id=canonical_id,
-                        mission=mission,
-                        n_points=features.get('temp_n_points', 0),
-                        duration_days=features.get('temp_duration_days', 0),
-                        is_anomaly=is_anomaly,  # Ground truth label
-                    )
-
-                    await self.database_client.insert_features(
-                        target_id=canonical_id,
-                        features=features,
-                        validity=validity,
-                        extraction_time=time.time() - start_time,
-                    )
+                    target_row = {
+                        'target_id': canonical_id,
+                        'mission': mission.lower(),
+                        'n_points': features.get('temp_n_points', 0),
+                        'duration_days': features.get('temp_duration_days', 0),
+                        'features_extracted': False,
+                        'is_anomaly': is_anomaly,  # Ground truth label
+                    }
+                    feature_row = {
+                        'target_id': canonical_id,
+                        'extraction_time_seconds': time.time() - start_time,
+                        'n_features_valid': sum(validity.values()),
+                        'n_features_total': len(validity),
+                        **features
+                    }
 
-                    logger.info(f"{canonical_id}: Uploaded to database")
+                    # Buffer instead of two awaited round trips per target;
+                    # flushed as one multi-row upsert per table
+                    self._upload_buffer.append((target_row, feature_row))
+                    if len(self._upload_buffer) >= self._upload_buffer_size:
+                        await self._flush_uploads()
 
                 except Exception as e:
                     logger.error(f"KIC {kic_id}: Database upload failed: {e}")
@@ -340,6 +417,23 @@ class LocalProcessor:
                 'elapsed': time.time() - start_time
             }
 
+    async def _flush_uploads(self):
+        """Flush buffered rows as one bulk upsert per table."""
+        if not self._upload_buffer or self.database_client is None:
+            return
+
+        # Swap the buffer out first so rows queued while the flush is in
+        # flight land in the next batch
+        buffer, self._upload_buffer = self._upload_buffer, []
+
+        target_rows = [t for t, _ in buffer]
+        feature_rows = [f for _, f in buffer]
+
+        await self.database_client.batch_insert_targets(target_rows)
+        await self.database_client.batch_insert_features(feature_rows)
+
+        logger.info(f"Flushed {len(buffer)} targets to database")
+
     async def process_batch(
         self,
         kic_ids: List[str],
@@ -362,24 +456,43 @@ class LocalProcessor:
         label = "anomalies" if is_anomaly else "quiet stars"
         logger.info(f"Processing batch of {len(kic_ids)} {label}")
 
-        tasks = [
-            self.process_target(kic_id, mission, is_anomaly=is_anomaly)
-            for kic_id in kic_ids
-        ]
+        # Bounded consumer tasks pulling from a shared queue instead of
+        # one coroutine per target: the process-pool queue never backs up
+        # beyond ~2x the worker count (the extra headroom lets the next
+        # extraction start while a finished target's DB upload awaits),
+        # and a 900-target batch no longer allocates 900 coroutine frames
+        # up front.
+        queue: asyncio.Queue = asyncio.Queue()
+        for kic_id in kic_ids:
+            queue.put_nowait(kic_id)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results_by_id: Dict[str, Dict[str, Any]] = {}
 
-        # Handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    'kic_id': kic_ids[i],
-                    'success': False,
-                    'error': str(result)
-                })
-            else:
-                processed_results.append(result)
+        async def _worker():
+            while True:
+                try:
+                    kic_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results_by_id[kic_id] = await self.process_target(
+                        kic_id, mission, is_anomaly=is_anomaly
+                    )
+                except Exception as e:
+                    results_by_id[kic_id] = {
+                        'kic_id': kic_id,
+                        'success': False,
+                        'error': str(e)
+                    }
+
+        n_consumers = min(self.max_workers * 2, len(kic_ids))
+        await asyncio.gather(*[_worker() for _ in range(n_consumers)])
+
+        # Push out any rows still sitting in the upload buffer
+        await self._flush_uploads()
+
+        # Return results in input order
+        processed_results = [results_by_id[kic_id] for kic_id in kic_ids]
 
         # Summary
         successful = sum(1 for r in processed_results if r.get('success', False))
@@ -423,7 +536,6 @@ async def main():
     processor = LocalProcessor(
         fits_dir=fits_dir,
         database_client=db,
-        max_workers=2,
         delete_after_processing=do_delete,
     )
 
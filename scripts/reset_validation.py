@@ -37,6 +37,35 @@ def reset_database():
 
     print("Clearing Supabase tables...")
 
+    # Fast path for idempotent re-runs: two count-only HEAD requests, and
+    # if both tables are already empty skip the delete calls entirely
+    try:
+        targets_count = client.table('targets').select(
+            'id', count='exact'
+        ).limit(1).execute().count or 0
+        features_count = client.table('features').select(
+            'id', count='exact'
+        ).limit(1).execute().count or 0
+        if targets_count == 0 and features_count == 0:
+            print("  Tables already empty - nothing to delete")
+            return True
+    except Exception as e:
+        print(f"  Warning checking table counts: {e}")
+
+    # Preferred path: one RPC call runs both DELETEs server-side in a
+    # single transaction (see scripts/add_reset_validation_function.sql).
+    # One round-trip, and targets/features are cleared atomically.
+    try:
+        result = client.rpc('reset_validation_data').execute()
+        if result.data:
+            counts = result.data[0]
+            print(f"  Features deleted: {counts.get('features_deleted', '?')}")
+            print(f"  Targets deleted: {counts.get('targets_deleted', '?')}")
+        print("Database reset complete!")
+        return True
+    except Exception as e:
+        print(f"  RPC reset unavailable ({e}), falling back to table deletes")
+
     # Delete all features first (foreign key constraint)
     try:
         # Delete in batches to avoid timeout
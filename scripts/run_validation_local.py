@@ -73,12 +73,13 @@ async def main():
     logger.info("STEP 1: Generating Download URLs")
     logger.info("=" * 60)
 
-    from scripts.generate_download_urls import process_target_list
+    from scripts.generate_download_urls import process_target_list_async
 
     # Generate URLs for quiet stars
     if not quiet_urls.exists():
         logger.info(f"Generating URLs for quiet stars...")
-        process_target_list(quiet_file, quiet_urls)
+        # main() runs inside asyncio.run, so use the async API directly
+        await process_target_list_async(quiet_file, quiet_urls)
     else:
         logger.info(f"Using existing: {quiet_urls}")
 
@@ -125,7 +126,8 @@ async def main():
         timeout=60,
     )
 
-    download_results = downloader.download_from_file(all_urls)
+    # main() runs inside asyncio.run, so use the async API directly
+    download_results = await downloader.download_from_file_async(all_urls)
 
     download_success = sum(1 for r in download_results if r.success)
     logger.info(f"Downloaded: {download_success}/{len(download_results)} files")
@@ -161,18 +163,21 @@ async def main():
         delete_after_processing=True,  # Clean up to save disk space
     )
 
-    # Load quiet star and planet host lists for ground truth labeling
-    with open(quiet_file, 'r') as f:
-        quiet_star_ids = set()
-        for line in f:
-            line = line.strip()
-            if line:
-                # Extract numeric part for matching
-                num = line.replace('KIC ', '').lstrip('0') or '0'
-                quiet_star_ids.add(num)
-
-    with open(planet_file, 'r') as f:
-        planet_host_ids = set(line.strip() for line in f if line.strip())
+    # Load quiet star and planet host lists for ground truth labeling.
+    # read_text + splitlines does the line splitting in C in one pass
+    # instead of a Python-level iterator + strip per line.
+    quiet_star_ids = {
+        # Extract numeric part for matching
+        line.strip().replace('KIC ', '').lstrip('0') or '0'
+        for line in Path(quiet_file).read_text().splitlines()
+        if line.strip()
+    }
+
+    planet_host_ids = {
+        line.strip()
+        for line in Path(planet_file).read_text().splitlines()
+        if line.strip()
+    }
 
     logger.info(f"Ground truth: {len(quiet_star_ids)} quiet stars, {len(planet_host_ids)} planet hosts")
 
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Shared NASA Exoplanet Archive TAP client with on-disk caching.
+
+The catalogs behind the TAP service change at most daily, but the fetch
+scripts re-ran the same multi-MB queries on every invocation. Responses
+are cached under data/.tap_cache keyed by a hash of the query text, so
+re-runs within the TTL skip both the HTTPS transfer and the server-side
+SQL execution entirely.
+
+Results are requested as VOTable rather than CSV: the payload carries
+its own column types, so parsing skips both the full-body UTF-8 decode
+(`response.text`) and pandas' two-pass CSV type inference.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+
+import requests
+import pandas as pd
+from astropy.io.votable import parse_single_table
+
+# NASA Exoplanet Archive TAP service
+TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+
+CACHE_DIR = Path(__file__).parent.parent / "data" / ".tap_cache"
+DEFAULT_TTL_SECONDS = 86400  # catalogs update at most daily
+
+
+def _cache_path(query: str) -> Path:
+    """Content-addressed cache file for a query string."""
+    digest = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.vot"
+
+
+def _parse_votable(path: Path) -> pd.DataFrame:
+    """Parse a VOTable file into a DataFrame."""
+    return parse_single_table(str(path)).to_table().to_pandas()
+
+
+def tap_query(query: str, ttl: int = DEFAULT_TTL_SECONDS) -> pd.DataFrame:
+    """
+    Run a TAP query, serving repeat runs from the on-disk cache.
+
+    Args:
+        query: ADQL query string
+        ttl: Cache lifetime in seconds (default 24h); pass 0 to force
+            a fresh fetch
+
+    Returns:
+        DataFrame of results
+
+    Raises:
+        Exception: If the TAP request fails
+    """
+    cache_path = _cache_path(query)
+
+    if (
+        ttl > 0
+        and cache_path.exists()
+        and time.time() - cache_path.stat().st_mtime < ttl
+    ):
+        print(f"  (cached: {cache_path.name})")
+        return _parse_votable(cache_path)
+
+    # Stream the body straight to the cache file in 1 MB chunks: peak
+    # memory stays flat instead of holding the whole multi-MB response
+    # in response.content before writing it out
+    with requests.get(
+        TAP_URL, params={'query': query, 'format': 'votable'}, stream=True
+    ) as response:
+        if response.status_code != 200:
+            raise Exception(f"TAP query failed: {response.status_code}\n{response.text}")
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file then rename so a failed run never leaves a
+        # truncated cache entry behind
+        temp_path = cache_path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        temp_path.rename(cache_path)
+
+    return _parse_votable(cache_path)